@@ -2,8 +2,9 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.prompts import ChatPromptTemplate
 from langchain.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
 from config import config
+import asyncio
 import re
 import json
 
@@ -44,6 +45,95 @@ class LessonPlan(BaseModel):
     comprehension_questions: List[ComprehensionQuestion] = Field(description="5-8 comprehension check questions to assess understanding")
 
 
+class VocabularySection(BaseModel):
+    """Replacement vocabulary for an existing lesson plan"""
+    vocabulary_words: List[VocabularyWord] = Field(description="Key vocabulary words to teach")
+
+
+class SentenceStructureSection(BaseModel):
+    """Replacement sentence structures for an existing lesson plan"""
+    sentence_structures: List[SentenceStructure] = Field(description="Important sentence structures to focus on")
+
+
+class ComprehensionSection(BaseModel):
+    """Replacement comprehension questions for an existing lesson plan"""
+    comprehension_questions: List[ComprehensionQuestion] = Field(description="5-8 comprehension check questions to assess understanding")
+
+
+class LearningObjectivesSection(BaseModel):
+    """Replacement learning objectives for an existing lesson plan"""
+    learning_objectives: List[str] = Field(description="Learning objectives for this lesson")
+
+
+# Lesson plan sections that can be regenerated on their own, with what to ask for
+SECTIONS = {
+    "vocabulary_words": (VocabularySection, "5-10 key vocabulary words that are important or challenging"),
+    "sentence_structures": (SentenceStructureSection, "3-5 important sentence structures or grammatical patterns"),
+    "comprehension_questions": (
+        ComprehensionSection,
+        "5-8 comprehension check questions mixing multiple choice (4 options each), "
+        "true/false and fill-in-the-blank questions"
+    ),
+    "learning_objectives": (LearningObjectivesSection, "clear learning objectives"),
+}
+
+
+# Prompt templates for lesson plan generation. Kept at module level so build
+# tooling can fingerprint them and detect when pre-generated lessons are stale.
+SYSTEM_PROMPT = """You are an expert language teacher and curriculum designer.
+Your task is to analyze a monologue in a foreign language and create a comprehensive lesson plan.
+
+You should:
+1. Identify the language and estimate the proficiency level
+2. Extract 5-10 key vocabulary words that are important or challenging
+3. Identify 3-5 important sentence structures or grammatical patterns
+4. Create clear learning objectives
+5. Generate 5-8 comprehension check questions to assess student understanding
+
+For comprehension questions, create a mix of:
+- Multiple choice questions (with 4 options each)
+- True/False questions
+- Fill-in-the-blank questions (testing vocabulary or grammar from the monologue)
+
+Questions should test understanding of the monologue content, vocabulary usage, and grammatical structures.
+Focus on words and structures that would be most valuable for language learners.
+
+IMPORTANT: You MUST respond with valid JSON only. Do not include any additional text, explanations, or markdown formatting.
+Your response should be a single JSON object that matches the schema exactly.
+
+{format_instructions}"""
+
+USER_PROMPT = "Analyze this monologue and create a lesson plan.{language_hint} Respond with ONLY valid JSON:\n\n{monologue}"
+
+# Filled into {language_hint} when the audio's language was identified before transcription
+LANGUAGE_HINT_PROMPT = " The audio was identified as {language}; use that as detected_language."
+
+
+SECTION_SYSTEM_PROMPT = """You are an expert language teacher and curriculum designer.
+You are revising one section of an existing lesson plan for a monologue in a foreign language.
+
+Produce a new version of the "{section}" section: {section_description}.
+Keep it consistent with the rest of the lesson plan and follow the teacher's instructions if any are given.
+
+IMPORTANT: You MUST respond with valid JSON only. Do not include any additional text, explanations, or markdown formatting.
+Your response should be a single JSON object that matches the schema exactly.
+
+{format_instructions}"""
+
+SECTION_USER_PROMPT = """Monologue:
+{monologue}
+
+Lesson plan context:
+{context}
+
+Current "{section}" section (replace it):
+{current}
+
+Teacher instructions: {instructions}
+
+Respond with ONLY valid JSON for the new "{section}" section."""
+
+
 class LanguageLearningAgent:
     """LangChain agent using Google Gemini to generate lesson plans from foreign language monologues"""
 
@@ -87,92 +177,150 @@ class LanguageLearningAgent:
     def _setup_prompt(self):
         """Setup the prompt template"""
         self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert language teacher and curriculum designer.
-Your task is to analyze a monologue in a foreign language and create a comprehensive lesson plan.
+            ("system", SYSTEM_PROMPT),
+            ("user", USER_PROMPT)
+        ])
 
-You should:
-1. Identify the language and estimate the proficiency level
-2. Extract 5-10 key vocabulary words that are important or challenging
-3. Identify 3-5 important sentence structures or grammatical patterns
-4. Create clear learning objectives
-5. Generate 5-8 comprehension check questions to assess student understanding
+    def _lesson_inputs(self, monologue: str, language: Optional[str] = None) -> dict:
+        """Prompt inputs for a full lesson plan"""
+        return {
+            "monologue": monologue,
+            "language_hint": LANGUAGE_HINT_PROMPT.format(language=language) if language else "",
+            "format_instructions": self.parser.get_format_instructions()
+        }
+
+    def _parse_lesson_response(self, content: str) -> LessonPlan:
+        """Clean and parse a raw lesson plan response"""
+        # Debug: print raw response
+        print("=" * 80)
+        print("RAW LLM RESPONSE:")
+        print(content[:500])  # First 500 chars
+        print("=" * 80)
+
+        # Clean the response text
+        cleaned_text = self.clean_json_response(content)
+
+        # Debug: print cleaned response
+        print("CLEANED JSON:")
+        print(cleaned_text[:500])  # First 500 chars
+        print("=" * 80)
+
+        # Parse with the cleaned text
+        return self.parser.parse(cleaned_text)
+
+    async def _afix_response(self, parser: PydanticOutputParser, content: str):
+        """Clean a raw response and let the LLM repair it into parser's schema"""
+        from langchain.output_parsers import OutputFixingParser
 
-For comprehension questions, create a mix of:
-- Multiple choice questions (with 4 options each)
-- True/False questions
-- Fill-in-the-blank questions (testing vocabulary or grammar from the monologue)
+        cleaned_text = self.clean_json_response(content)
+        return await OutputFixingParser.from_llm(parser=parser, llm=self.llm).aparse(cleaned_text)
 
-Questions should test understanding of the monologue content, vocabulary usage, and grammatical structures.
-Focus on words and structures that would be most valuable for language learners.
+    def generate_lesson_plan(self, monologue: str, language: Optional[str] = None) -> LessonPlan:
+        """
+        Generate a lesson plan from a foreign language monologue.
 
-IMPORTANT: You MUST respond with valid JSON only. Do not include any additional text, explanations, or markdown formatting.
-Your response should be a single JSON object that matches the schema exactly.
+        Blocking wrapper around agenerate_lesson_plan for scripts without an
+        event loop (e.g. the agent CLI).
 
-{format_instructions}"""),
-            ("user", "Analyze this monologue and create a lesson plan. Respond with ONLY valid JSON:\n\n{monologue}")
-        ])
+        Args:
+            monologue: The text of the monologue in a foreign language
+            language: Language already identified from the audio, if any
+
+        Returns:
+            LessonPlan object with vocabulary, structures, and teaching suggestions
+        """
+        return asyncio.run(self.agenerate_lesson_plan(monologue, language))
 
-    def generate_lesson_plan(self, monologue: str) -> LessonPlan:
+    async def agenerate_lesson_plan(self, monologue: str, language: Optional[str] = None) -> LessonPlan:
         """
         Generate a lesson plan from a foreign language monologue.
 
+        Cancelling the awaiting task aborts the in-flight LLM request.
+
         Args:
             monologue: The text of the monologue in a foreign language
+            language: Language already identified from the audio, if any
 
         Returns:
             LessonPlan object with vocabulary, structures, and teaching suggestions
         """
-        from langchain.output_parsers import OutputFixingParser
-
+        chain = self.prompt | self.llm
         try:
             # First attempt: generate and clean the output
-            chain = self.prompt | self.llm
+            response = await chain.ainvoke(self._lesson_inputs(monologue, language))
+            return self._parse_lesson_response(response.content)
+        except Exception as e:
+            # If parsing fails, try with OutputFixingParser which uses the LLM to fix the output
+            print(f"Initial parsing failed: {e}. Attempting to fix output...")
 
-            response = chain.invoke({
-                "monologue": monologue,
-                "format_instructions": self.parser.get_format_instructions()
-            })
+            try:
+                # Get the raw response again, then clean and fix it
+                response = await chain.ainvoke(self._lesson_inputs(monologue, language))
+                return await self._afix_response(self.parser, response.content)
+            except Exception as e2:
+                print(f"OutputFixingParser also failed: {e2}")
+                raise Exception(f"Failed to generate valid lesson plan: {str(e2)}")
 
-            # Debug: print raw response
-            print("=" * 80)
-            print("RAW LLM RESPONSE:")
-            print(response.content[:500])  # First 500 chars
-            print("=" * 80)
+    def _section_request(self, monologue: str, lesson_plan: LessonPlan, section: str, instructions: str):
+        """Build the prompt, parser and inputs for regenerating one section"""
+        if section not in SECTIONS:
+            raise ValueError(f"Unknown section: {section}")
 
-            # Clean the response text
-            cleaned_text = self.clean_json_response(response.content)
+        section_model, section_description = SECTIONS[section]
+        parser = PydanticOutputParser(pydantic_object=section_model)
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", SECTION_SYSTEM_PROMPT),
+            ("user", SECTION_USER_PROMPT)
+        ])
 
-            # Debug: print cleaned response
-            print("CLEANED JSON:")
-            print(cleaned_text[:500])  # First 500 chars
-            print("=" * 80)
+        context = {
+            "detected_language": lesson_plan.detected_language,
+            "proficiency_level": lesson_plan.proficiency_level,
+            "summary": lesson_plan.summary,
+            "vocabulary": [word.word for word in lesson_plan.vocabulary_words],
+            "sentence_structures": [structure.structure_name for structure in lesson_plan.sentence_structures],
+        }
+        inputs = {
+            "section": section,
+            "section_description": section_description,
+            "format_instructions": parser.get_format_instructions(),
+            "monologue": monologue,
+            "context": json.dumps(context, ensure_ascii=False),
+            "current": json.dumps(lesson_plan.model_dump()[section], ensure_ascii=False),
+            "instructions": instructions or "none"
+        }
+        return prompt, parser, inputs
+
+    async def aregenerate_section(self, monologue: str, lesson_plan: LessonPlan, section: str,
+                                  instructions: str = "") -> LessonPlan:
+        """
+        Regenerate one section of a lesson plan, leaving the other sections untouched.
 
-            # Parse with the cleaned text
-            result = self.parser.parse(cleaned_text)
+        Only the requested section is generated, so output tokens and latency
+        are a fraction of a full lesson plan generation. Cancelling the awaiting
+        task aborts the in-flight LLM request.
 
-            return result
-        except Exception as e:
-            # If parsing fails, try with OutputFixingParser which uses the LLM to fix the output
-            print(f"Initial parsing failed: {e}. Attempting to fix output...")
-
-            try:
-                fixing_parser = OutputFixingParser.from_llm(parser=self.parser, llm=self.llm)
+        Args:
+            monologue: The text of the monologue in a foreign language
+            lesson_plan: The existing lesson plan
+            section: One of SECTIONS ('vocabulary_words', 'sentence_structures',
+                'comprehension_questions' or 'learning_objectives')
+            instructions: Optional teacher instructions, e.g. "more questions about verbs"
 
-                # Get the raw response again
-                chain = self.prompt | self.llm
-                response = chain.invoke({
-                    "monologue": monologue,
-                    "format_instructions": self.parser.get_format_instructions()
-                })
+        Returns:
+            New LessonPlan with only the requested section replaced
+        """
+        prompt, parser, inputs = self._section_request(monologue, lesson_plan, section, instructions)
+        response = await (prompt | self.llm).ainvoke(inputs)
 
-                # Clean and fix
-                cleaned_text = self.clean_json_response(response.content)
-                result = fixing_parser.parse(cleaned_text)
+        try:
+            result = parser.parse(self.clean_json_response(response.content))
+        except Exception as e:
+            # Let the LLM repair the output rather than regenerating the section
+            print(f"Section parsing failed: {e}. Attempting to fix output...")
+            result = await self._afix_response(parser, response.content)
 
-                return result
-            except Exception as e2:
-                print(f"OutputFixingParser also failed: {e2}")
-                raise Exception(f"Failed to generate valid lesson plan: {str(e2)}")
+        return lesson_plan.model_copy(update={section: getattr(result, section)})
 
     def format_lesson_plan(self, lesson_plan: LessonPlan) -> str:
         """
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import ReactMarkdown from 'react-markdown';
 import './LessonView.css';
+import { sampledVideoHash } from '../videoHash';
 
 interface LessonPlan {
   detected_language: string;
@@ -29,10 +30,23 @@ interface LessonPlan {
 }
 
 interface ApiResponse {
+  lesson_id?: number;
   transcript: string;
   lesson_plan: LessonPlan;
 }
 
+interface DetailPanel {
+  description: string;
+  examples: string[];
+}
+
+interface SampleResponse extends ApiResponse {
+  details: {
+    vocab?: Record<string, DetailPanel>;
+    grammar?: Record<string, DetailPanel>;
+  };
+}
+
 interface LessonViewProps {
   videoUrl: string;
   videoTitle: string;
@@ -69,16 +83,21 @@ const LessonView: React.FC<LessonViewProps> = ({ videoUrl, videoTitle, onBack })
     const key = `${type}-${index}`;
     setLoadingExamples(prev => new Set(prev).add(key));
 
+    // Detail panels are cached per lesson language
+    const language = result?.lesson_plan.detected_language;
+
     try {
       const requestBody = type === 'vocab'
         ? {
             item_type: 'vocab',
             word: item.word,
-            translation: item.translation
+            translation: item.translation,
+            language
           }
         : {
             item_type: 'grammar',
-            structure_name: item.structure_name
+            structure_name: item.structure_name,
+            language
           };
 
       const response = await fetch('http://localhost:8000/llm/generate-examples', {
@@ -145,6 +164,27 @@ const LessonView: React.FC<LessonViewProps> = ({ videoUrl, videoTitle, onBack })
       setError(null);
 
       try {
+        // Bundled samples have pre-generated lessons; use them when available
+        const videoName = videoUrl.split('/').pop() || 'video.mp4';
+        const sampleResponse = await fetch(`http://localhost:8000/llm/samples/${encodeURIComponent(videoName)}`);
+        if (sampleResponse.ok) {
+          const sample: SampleResponse = await sampleResponse.json();
+          const vocabDetails = new Map<number, DetailPanel>();
+          sample.lesson_plan.vocabulary_words.forEach((word, idx) => {
+            const detail = sample.details.vocab?.[word.word];
+            if (detail) vocabDetails.set(idx, detail);
+          });
+          const grammarDetails = new Map<number, DetailPanel>();
+          sample.lesson_plan.sentence_structures.forEach((structure, idx) => {
+            const detail = sample.details.grammar?.[structure.structure_name];
+            if (detail) grammarDetails.set(idx, detail);
+          });
+          setVocabExamples(vocabDetails);
+          setGrammarExamples(grammarDetails);
+          setResult({ transcript: sample.transcript, lesson_plan: sample.lesson_plan });
+          return;
+        }
+
         // Fetch the video file from the public directory
         const videoResponse = await fetch(videoUrl);
         if (!videoResponse.ok) {
@@ -152,7 +192,24 @@ const LessonView: React.FC<LessonViewProps> = ({ videoUrl, videoTitle, onBack })
         }
 
         const videoBlob = await videoResponse.blob();
-        const videoFile = new File([videoBlob], videoUrl.split('/').pop() || 'video.mp4', {
+
+        // Ask the server whether it already knows this video before uploading it
+        const checkResponse = await fetch('http://localhost:8000/llm/check-video', {
+          method: 'POST',
+          headers: {
+            'Content-Type': 'application/json',
+          },
+          body: JSON.stringify({ sampled_hash: await sampledVideoHash(videoBlob) }),
+        });
+        if (checkResponse.ok) {
+          const check = await checkResponse.json();
+          if (check.status === 'hit') {
+            setResult({ lesson_id: check.lesson_id, transcript: check.transcript, lesson_plan: check.lesson_plan });
+            return;
+          }
+        }
+
+        const videoFile = new File([videoBlob], videoName, {
           type: videoBlob.type || 'video/mp4'
         });
 
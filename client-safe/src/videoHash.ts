@@ -0,0 +1,25 @@
+// Sampled content hash of a video, matching hash_file_sampled in
+// server/services/content_hash.py: SHA-256 over "<size>:" followed by the
+// first, middle and last 64 KiB (the whole file when smaller than 192 KiB).
+const SAMPLE_CHUNK_SIZE = 64 * 1024;
+
+export async function sampledVideoHash(blob: Blob): Promise<string> {
+  const size = blob.size;
+  let chunks: Blob[];
+  if (size <= 3 * SAMPLE_CHUNK_SIZE) {
+    chunks = [blob];
+  } else {
+    const middle = Math.floor(size / 2) - SAMPLE_CHUNK_SIZE / 2;
+    chunks = [
+      blob.slice(0, SAMPLE_CHUNK_SIZE),
+      blob.slice(middle, middle + SAMPLE_CHUNK_SIZE),
+      blob.slice(size - SAMPLE_CHUNK_SIZE),
+    ];
+  }
+
+  const data = await new Blob([`${size}:`, ...chunks]).arrayBuffer();
+  const digest = await crypto.subtle.digest('SHA-256', data);
+  return Array.from(new Uint8Array(digest))
+    .map(b => b.toString(16).padStart(2, '0'))
+    .join('');
+}
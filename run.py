@@ -1,4 +1,35 @@
+import argparse
+import os
+
 import uvicorn
 
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Lingua API server")
+    parser.add_argument("--prod", action="store_true",
+                        help="Production mode: multiple workers, no auto-reload")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("LINGUA_WORKERS", os.cpu_count() or 1)),
+                        help="Worker processes in production mode (default: LINGUA_WORKERS or CPU count)")
+    parser.add_argument("--host", default=os.getenv("LINGUA_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("LINGUA_PORT", "8000")))
+    parser.add_argument("--graceful-timeout", type=int, default=int(os.getenv("LINGUA_GRACEFUL_TIMEOUT", "120")),
+                        help="Seconds to let in-flight requests drain on shutdown")
+    args = parser.parse_args()
+
+    if args.prod:
+        # Each worker preloads its own app state on startup (see main.lifespan);
+        # caches and single-flight coordination are shared through SQLite.
+        uvicorn.run(
+            "main:app",
+            app_dir="server",
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            timeout_graceful_shutdown=args.graceful_timeout,
+        )
+    else:
+        uvicorn.run("main:app", app_dir="server", host=args.host, port=args.port, reload=True)
+
+
 if __name__ == "__main__":
-    uvicorn.run("server.main:app", host="0.0.0.0", port=8000, reload=True)
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark local language identification on the bundled sample videos.
+
+For each clip and sample length, reports the extra extraction time of cutting
+the language ID sample in the same ffmpeg pass, the identification latency
+(first run includes model loading), and whether the detected language matches
+the clip's known language.
+
+Usage (from the server directory):
+    python bench_language_id.py [--sample-seconds 5,10,20] [--runs 3]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from bench_transcription import SAMPLE_LANGUAGES
+from services.language_id import language_identifier
+from services.sample_library import DEFAULT_VIDEOS_DIR, VIDEO_EXTENSIONS
+from services.transcription import get_audio_duration
+from services.video_service import extract_audio_from_video, extract_audio_with_sample
+
+
+def expected_language(video_path: Path) -> str:
+    for prefix, codes in SAMPLE_LANGUAGES.items():
+        if video_path.name.startswith(prefix):
+            return codes[0]
+    return ""
+
+
+def _remove(*paths):
+    for path in paths:
+        if path and os.path.exists(path):
+            os.remove(path)
+
+
+async def bench_clip(video_path: Path, sample_seconds: float, runs: int) -> dict:
+    """
+    Measure extraction overhead and language ID latency for one clip.
+
+    Args:
+        video_path: Path to the sample video
+        sample_seconds: Length of the language ID sample
+        runs: Identification runs (the first may include model loading)
+
+    Returns:
+        Dictionary of results
+    """
+    start = time.perf_counter()
+    audio_path = await extract_audio_from_video(str(video_path))
+    plain_seconds = time.perf_counter() - start
+    duration = get_audio_duration(audio_path)
+    _remove(audio_path)
+
+    start = time.perf_counter()
+    audio_path, sample_path = await extract_audio_with_sample(str(video_path), sample_seconds)
+    with_sample_seconds = time.perf_counter() - start
+
+    try:
+        latencies = []
+        result = None
+        for _ in range(runs):
+            start = time.perf_counter()
+            result = await language_identifier.identify(sample_path)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        _remove(audio_path, sample_path)
+
+    steady = latencies[1:] or latencies
+    expected = expected_language(video_path)
+    detected = result["language_code"] if result else None
+    return {
+        "video": video_path.name,
+        "audio_seconds": round(duration, 2),
+        "sample_seconds": sample_seconds,
+        "extract_seconds": round(plain_seconds, 3),
+        "extract_with_sample_seconds": round(with_sample_seconds, 3),
+        "first_run_seconds": round(latencies[0], 3),
+        "median_seconds": round(statistics.median(steady), 3),
+        "share_of_audio": round(statistics.median(steady) / duration, 4),
+        "expected": expected,
+        "detected": detected,
+        "probability": result["probability"] if result else None,
+        "correct": bool(expected) and detected == expected
+    }
+
+
+async def main_async(args) -> list:
+    videos = sorted(p for p in args.videos_dir.iterdir() if p.suffix.lower() in VIDEO_EXTENSIONS)
+    results = []
+    for sample_seconds in args.sample_seconds:
+        for video_path in videos:
+            print(f"Identifying {video_path.name} from a {sample_seconds:g}s sample...")
+            results.append(await bench_clip(video_path, sample_seconds, args.runs))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark local language identification on the sample videos")
+    parser.add_argument("--sample-seconds", default="5,10,20", help="Comma-separated sample lengths to compare")
+    parser.add_argument("--runs", type=int, default=3, help="Identification runs per clip")
+    parser.add_argument("--videos-dir", type=Path, default=DEFAULT_VIDEOS_DIR)
+    parser.add_argument("--output", type=Path, help="Also write results as JSON to this file")
+    args = parser.parse_args()
+    args.sample_seconds = [float(value) for value in args.sample_seconds.split(",") if value.strip()]
+
+    if not language_identifier.is_available():
+        print("Error: language identification needs the faster-whisper package (and LANGUAGE_ID_ENABLED)")
+        sys.exit(1)
+
+    results = asyncio.run(main_async(args))
+
+    print("\n" + "=" * 100)
+    print(f"LANGUAGE ID ({language_identifier.model_size})")
+    print("=" * 100)
+    print(f"{'video':<24}{'sample s':>9}{'extract s':>11}{'+sample s':>11}{'first s':>9}"
+          f"{'median s':>10}{'expected':>10}{'detected':>10}{'p':>7}")
+    for clip in results:
+        print(f"{clip['video']:<24}{clip['sample_seconds']:>9g}{clip['extract_seconds']:>11}"
+              f"{clip['extract_with_sample_seconds']:>11}{clip['first_run_seconds']:>9}{clip['median_seconds']:>10}"
+              f"{clip['expected']:>10}{str(clip['detected']):>10}{str(clip['probability']):>7}")
+
+    for sample_seconds in args.sample_seconds:
+        clips = [clip for clip in results if clip["sample_seconds"] == sample_seconds]
+        correct = sum(clip["correct"] for clip in clips)
+        print(f"{sample_seconds:g}s sample: {correct}/{len(clips)} correct, "
+              f"median {statistics.median(clip['median_seconds'] for clip in clips):.3f}s per clip")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
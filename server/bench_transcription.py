@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Benchmark transcription backends on the bundled sample videos.
+
+Reports per-clip latency and real-time factor (seconds of processing per second
+of audio), plus aggregate throughput when clips are transcribed concurrently.
+The local backend runs fully offline once its model has been downloaded.
+
+Usage (from the server directory):
+    python bench_transcription.py [--backends local,google] [--runs 3] [--concurrency 3]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from services.sample_library import DEFAULT_VIDEOS_DIR, VIDEO_EXTENSIONS
+from services.transcription import BACKENDS, DEFAULT_LANGUAGE_CODES, get_audio_duration
+from services.video_service import extract_audio_from_video
+
+# Languages of the bundled samples, so each clip is recognized as its own language
+SAMPLE_LANGUAGES = {
+    "english": ["en-US"],
+    "french": ["fr-FR"],
+    "spanish": ["es-ES"],
+}
+
+
+def languages_for(video_path: Path) -> list:
+    for prefix, codes in SAMPLE_LANGUAGES.items():
+        if video_path.name.startswith(prefix):
+            return codes
+    return DEFAULT_LANGUAGE_CODES
+
+
+async def bench_backend(backend, clips: list, runs: int, concurrency: int) -> dict:
+    """
+    Measure one backend on every clip.
+
+    Args:
+        backend: TranscriptionBackend instance
+        clips: List of (video_path, audio_path, duration) tuples
+        runs: Sequential runs per clip (the first run includes model warm-up)
+        concurrency: Number of clips transcribed at once for the throughput test
+
+    Returns:
+        Dictionary of results
+    """
+    results = {"backend": backend.name, "clips": []}
+
+    for video_path, audio_path, duration in clips:
+        latencies = []
+        transcript = ""
+        for _ in range(runs):
+            start = time.perf_counter()
+            transcript = await backend.transcribe(audio_path, languages_for(video_path))
+            latencies.append(time.perf_counter() - start)
+
+        steady = latencies[1:] or latencies
+        results["clips"].append({
+            "video": video_path.name,
+            "audio_seconds": round(duration, 2),
+            "first_run_seconds": round(latencies[0], 3),
+            "median_seconds": round(statistics.median(steady), 3),
+            "real_time_factor": round(statistics.median(steady) / duration, 3),
+            "transcript_preview": transcript[:80]
+        })
+
+    # Throughput: every clip, `concurrency` at a time
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(video_path, audio_path):
+        async with semaphore:
+            await backend.transcribe(audio_path, languages_for(video_path))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(video_path, audio_path) for video_path, audio_path, _ in clips))
+    elapsed = time.perf_counter() - start
+    total_audio = sum(duration for _, _, duration in clips)
+    results["throughput"] = {
+        "concurrency": concurrency,
+        "wall_seconds": round(elapsed, 3),
+        "audio_seconds_per_second": round(total_audio / elapsed, 2)
+    }
+    return results
+
+
+async def main_async(args) -> list:
+    videos = sorted(p for p in args.videos_dir.iterdir() if p.suffix.lower() in VIDEO_EXTENSIONS)
+
+    clips = []
+    for video_path in videos:
+        start = time.perf_counter()
+        audio_path = await extract_audio_from_video(str(video_path))
+        extract_seconds = time.perf_counter() - start
+        duration = get_audio_duration(audio_path)
+        print(f"Extracted {video_path.name}: {duration:.1f}s audio in {extract_seconds:.2f}s")
+        clips.append((video_path, audio_path, duration))
+
+    all_results = []
+    try:
+        for name in args.backends:
+            backend = BACKENDS[name]
+            if not backend.is_available():
+                print(f"Skipping {name}: not available in this environment")
+                continue
+            print(f"Benchmarking {name}...")
+            all_results.append(await bench_backend(backend, clips, args.runs, args.concurrency))
+    finally:
+        for _, audio_path, _ in clips:
+            if os.path.exists(audio_path):
+                os.remove(audio_path)
+
+    return all_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transcription backends on the sample videos")
+    parser.add_argument("--backends", default="local", help="Comma-separated backends to run")
+    parser.add_argument("--runs", type=int, default=3, help="Sequential runs per clip")
+    parser.add_argument("--concurrency", type=int, default=3, help="Clips transcribed at once for throughput")
+    parser.add_argument("--videos-dir", type=Path, default=DEFAULT_VIDEOS_DIR)
+    parser.add_argument("--output", type=Path, help="Also write results as JSON to this file")
+    args = parser.parse_args()
+    args.backends = [name.strip() for name in args.backends.split(",") if name.strip()]
+
+    unknown = [name for name in args.backends if name not in BACKENDS]
+    if unknown:
+        print(f"Error: unknown backend(s): {', '.join(unknown)}")
+        sys.exit(1)
+
+    results = asyncio.run(main_async(args))
+
+    for result in results:
+        print("\n" + "=" * 80)
+        print(f"{result['backend'].upper()}")
+        print("=" * 80)
+        print(f"{'video':<24}{'audio s':>9}{'first s':>10}{'median s':>10}{'RTF':>8}")
+        for clip in result["clips"]:
+            print(f"{clip['video']:<24}{clip['audio_seconds']:>9}{clip['first_run_seconds']:>10}"
+                  f"{clip['median_seconds']:>10}{clip['real_time_factor']:>8}")
+        throughput = result["throughput"]
+        print(f"Throughput at concurrency {throughput['concurrency']}: "
+              f"{throughput['audio_seconds_per_second']} audio s/s ({throughput['wall_seconds']}s wall)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
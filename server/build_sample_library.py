@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Build step that runs the full transcription and lesson pipeline once for every
+bundled sample video and writes the results to static JSON.
+
+The API serves these artifacts directly (see services/sample_library.py), so
+trying one of the sample videos costs no transcription or LLM calls. Each
+manifest entry records the video's content hash and the prompt fingerprint, and
+samples are only regenerated when either changes.
+
+Usage (from the server directory):
+    python build_sample_library.py [--force] [--videos-dir DIR] [--output-dir DIR]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from services.agent_service import agent_service
+from services.content_hash import hash_file, hash_file_sampled
+from services.sample_library import DEFAULT_LIBRARY_DIR, DEFAULT_VIDEOS_DIR, MANIFEST_NAME, VIDEO_EXTENSIONS
+from services.video_service import process_video
+
+
+async def build_sample(video_path: Path) -> dict:
+    """
+    Run transcription, lesson generation and every detail panel for one video.
+
+    Args:
+        video_path: Path to the sample video
+
+    Returns:
+        Artifact dictionary with transcript, lesson_plan and details
+    """
+    transcription = await process_video(str(video_path))
+    transcript = transcription["transcript"]
+    if not transcript:
+        raise ValueError(f"No speech detected in {video_path.name}")
+
+    language = transcription["language"]
+    lesson_plan = await agent_service.generate_lesson_plan(transcript, language["language"] if language else None)
+
+    details = {"vocab": {}, "grammar": {}}
+    for word in lesson_plan["vocabulary_words"]:
+        details["vocab"][word["word"]] = await agent_service.generate_detailed_info(
+            item_type="vocab",
+            word=word["word"],
+            translation=word["translation"]
+        )
+    for structure in lesson_plan["sentence_structures"]:
+        details["grammar"][structure["structure_name"]] = await agent_service.generate_detailed_info(
+            item_type="grammar",
+            word=structure["structure_name"],
+            structure_name=structure["structure_name"]
+        )
+
+    return {
+        "transcript": transcript,
+        "lesson_plan": lesson_plan,
+        "details": details
+    }
+
+
+async def build_library(videos_dir: Path, output_dir: Path, force: bool = False) -> int:
+    """
+    Build or refresh the sample library.
+
+    Args:
+        videos_dir: Directory containing the bundled sample videos
+        output_dir: Directory to write artifacts and the manifest to
+        force: Regenerate every sample even if its manifest entry is current
+
+    Returns:
+        Number of samples that were (re)generated
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_dir / MANIFEST_NAME
+
+    manifest = {"samples": {}}
+    if manifest_path.exists():
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    fingerprint = agent_service.prompt_fingerprint()
+    videos = sorted(p for p in videos_dir.iterdir() if p.suffix.lower() in VIDEO_EXTENSIONS)
+    built = 0
+
+    for video_path in videos:
+        video_sha256 = hash_file(str(video_path))
+        entry = manifest["samples"].get(video_path.name)
+
+        if (not force and entry
+                and entry.get("video_sha256") == video_sha256
+                and entry.get("prompt_fingerprint") == fingerprint
+                and entry.get("video_sampled_hash")
+                and (output_dir / entry["artifact"]).exists()):
+            print(f"Up to date: {video_path.name}")
+            continue
+
+        print(f"Generating lesson for {video_path.name}...")
+        artifact = await build_sample(video_path)
+        artifact["video"] = video_path.name
+        artifact["video_sha256"] = video_sha256
+
+        artifact_name = f"{video_path.stem}.json"
+        with open(output_dir / artifact_name, "w", encoding="utf-8") as f:
+            json.dump(artifact, f, ensure_ascii=False, indent=2)
+
+        manifest["samples"][video_path.name] = {
+            "artifact": artifact_name,
+            "video_sha256": video_sha256,
+            "video_sampled_hash": hash_file_sampled(str(video_path)),
+            "prompt_fingerprint": fingerprint
+        }
+        built += 1
+
+    # Drop entries for videos that are no longer bundled
+    names = {p.name for p in videos}
+    manifest["samples"] = {k: v for k, v in manifest["samples"].items() if k in names}
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    return built
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate lessons for the bundled sample videos")
+    parser.add_argument("--force", action="store_true", help="Regenerate every sample")
+    parser.add_argument("--videos-dir", type=Path, default=DEFAULT_VIDEOS_DIR)
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_LIBRARY_DIR)
+    args = parser.parse_args()
+
+    if not args.videos_dir.is_dir():
+        print(f"Error: videos directory not found: {args.videos_dir}")
+        sys.exit(1)
+
+    built = asyncio.run(build_library(args.videos_dir, args.output_dir, force=args.force))
+    print(f"Sample library ready ({built} sample(s) regenerated) in {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,43 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routers import general, llm
+from routers import general, llm, lessons
+from services.admission import AdmissionGate
+from services.agent_service import agent_service
+from services.compression import CompressionMiddleware
+from services.language_id import language_identifier
+from services.lesson_store import lesson_store
+from services.sample_library import sample_library
+from services.serialization import JSONBytesResponse
+from services.shared_cache import shared_cache
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Preload per-worker state so the first request doesn't pay for it
+    agent_service.warm_up()
+    language_identifier.warm_up()
+    sample_library.load()
+    lesson_store.connect()
+    shared_cache.connect()
+
+    yield
+
+    # In-flight requests have drained by the time shutdown runs
+    lesson_store.close()
+    shared_cache.close()
+
 
 def create_app():
-    app = FastAPI(title="Lingua Language Learning API")
+    app = FastAPI(
+        title="Lingua Language Learning API",
+        lifespan=lifespan,
+        default_response_class=JSONBytesResponse
+    )
+
+    # Turn away uploads the server has no room for before their body is spooled to disk
+    # (added first so it sits inside CORS and rejections still carry CORS headers)
+    app.add_middleware(AdmissionGate)
 
     # Configure CORS
     app.add_middleware(
@@ -14,9 +48,13 @@ def create_app():
         allow_headers=["*"],
     )
 
+    # gzip/brotli for JSON responses, negotiated per client
+    app.add_middleware(CompressionMiddleware)
+
     # Include routers
     app.include_router(general.router)
     app.include_router(llm.router, prefix="/llm", tags=["LLM"])
+    app.include_router(lessons.router, prefix="/lessons", tags=["Lessons"])
 
     return app
 
@@ -1,7 +1,19 @@
 from fastapi import APIRouter
+from services.admission import admission
+from services.cancellation import stats as cancellation_stats
+from services.serialization import JSONBytesResponse
+from services.shared_cache import shared_cache
 
 router = APIRouter()
 
 @router.get("/health")
 async def health_check():
-    return {"status": "ok"}
+    return JSONBytesResponse({
+        "status": "ok",
+        "admission": admission.snapshot(),
+        "cancellation": {
+            "disconnected_requests": cancellation_stats["disconnected"],
+            "cancelled_work": shared_cache.stats["cancelled"],
+            "kept_for_other_waiters": shared_cache.stats["kept_for_waiters"]
+        }
+    })
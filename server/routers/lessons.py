@@ -0,0 +1,141 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from pydantic import BaseModel
+from services.agent_service import agent_service
+from services.content_hash import hash_bytes
+from services.lesson_store import lesson_store
+from services.shared_cache import shared_cache
+from services.admission import admission, PRIORITY_NORMAL
+from services.cancellation import run_until_disconnected
+from services.serialization import JSONBytesResponse
+
+router = APIRouter()
+
+
+class RegenerateSectionRequest(BaseModel):
+    section: str  # one of agent_service.regenerable_sections()
+    instructions: str = None
+
+
+@router.get("")
+async def list_lessons(
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    language: Optional[str] = None
+):
+    """
+    List stored lessons, newest first.
+
+    Args:
+        limit: Maximum number of lessons to return
+        offset: Number of lessons to skip
+        language: Only include lessons in this language (name or code, e.g. "Spanish" or "es")
+
+    Returns:
+        List of lesson summaries
+    """
+    return JSONBytesResponse(lesson_store.list_lessons(limit=limit, offset=offset, language=language))
+
+
+@router.get("/search")
+async def search_lessons(q: str, limit: int = Query(20, ge=1, le=100)):
+    """
+    Full-text search over stored lessons, including their vocabulary and structures.
+
+    Args:
+        q: Search terms
+        limit: Maximum number of lessons to return
+
+    Returns:
+        List of matching lesson summaries
+    """
+    return JSONBytesResponse(lesson_store.search_lessons(q, limit=limit))
+
+
+@router.get("/vocabulary")
+async def search_vocabulary(q: str, language: Optional[str] = None, limit: int = Query(20, ge=1, le=100)):
+    """
+    Find previously generated vocabulary words across all stored lessons.
+
+    Args:
+        q: Word or search terms
+        language: Only include words from lessons in this language (name or code)
+        limit: Maximum number of entries to return
+
+    Returns:
+        List of vocabulary words with the lesson they came from
+    """
+    return JSONBytesResponse(lesson_store.search_vocabulary(q, language=language, limit=limit))
+
+
+@router.get("/{lesson_id}")
+async def get_lesson(lesson_id: int):
+    """
+    Re-serve a stored lesson without any LLM call.
+
+    Args:
+        lesson_id: ID of the stored lesson
+
+    Returns:
+        Object containing lesson_id, transcription and lesson plan
+    """
+    # The stored plan is sent without being decoded and re-encoded
+    encoded = lesson_store.get_lesson_json(lesson_id)
+    if not encoded:
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    return JSONBytesResponse(encoded)
+
+
+@router.post("/{lesson_id}/regenerate")
+async def regenerate_section(lesson_id: int, request: RegenerateSectionRequest, http_request: Request):
+    """
+    Regenerate one section of a stored lesson plan, keeping the other sections as they are.
+
+    Args:
+        lesson_id: ID of the stored lesson
+        request: Contains the section to regenerate and optional teacher instructions
+
+    Returns:
+        Object containing lesson_id, transcription and the updated lesson plan
+    """
+    try:
+        sections = agent_service.regenerable_sections()
+        if request.section not in sections:
+            raise HTTPException(
+                status_code=400,
+                detail=f"section must be one of: {', '.join(sections)}"
+            )
+
+        lesson = lesson_store.get_lesson(lesson_id)
+        if not lesson:
+            raise HTTPException(status_code=404, detail="Lesson not found")
+
+        async def admitted() -> dict:
+            async with admission.admit("regenerate", PRIORITY_NORMAL):
+                return await agent_service.regenerate_section(
+                    lesson["transcript"], lesson["lesson_plan"], request.section, request.instructions or ""
+                )
+
+        regenerated = await run_until_disconnected(http_request, admitted())
+        # Write only this section onto the stored plan, which may have changed during the LLM call
+        lesson_plan = lesson_store.update_section(lesson_id, request.section, regenerated[request.section])
+        if lesson_plan is None:
+            raise HTTPException(status_code=404, detail="Lesson not found")
+
+        result = {
+            "lesson_id": lesson_id,
+            "transcript": lesson["transcript"],
+            "lesson_plan": lesson_plan
+        }
+        # Keep the shared cache in step so coalesced requests don't see the old plan. The
+        # entry is per transcript, so leave it alone if it belongs to another lesson.
+        cache_key = f"lesson:{hash_bytes(lesson['transcript'].encode('utf-8'))}"
+        cached = shared_cache.get(cache_key)
+        if cached and cached.get("lesson_id") == lesson_id:
+            shared_cache.set(cache_key, result)
+
+        return JSONBytesResponse(result)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error regenerating section: {str(e)}")
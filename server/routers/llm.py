@@ -1,9 +1,20 @@
+import asyncio
 import os
+import shutil
 import tempfile
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from typing import Optional
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Request
 from pydantic import BaseModel
 from services.video_service import process_video
 from services.agent_service import agent_service
+from services.content_hash import hash_bytes, hash_file, hash_file_sampled
+from services.sample_library import sample_library
+from services.lesson_store import detail_key, lesson_store
+from services.shared_cache import shared_cache
+from services.transcription import BACKENDS
+from services.admission import admission, PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL
+from services.cancellation import run_until_disconnected
+from services.serialization import JSONBytesResponse, extend_json
 
 router = APIRouter()
 
@@ -13,20 +24,128 @@ class GenerateExamplesRequest(BaseModel):
     word: str = None
     translation: str = None
     structure_name: str = None
+    language: str = None  # detected_language of the lesson the item comes from
+
+
+class CheckVideoRequest(BaseModel):
+    sha256: str = None  # full SHA-256 of the video
+    sampled_hash: str = None  # see services/content_hash.hash_file_sampled
+
+
+def _save_upload(source, video_path: str):
+    """Copy an uploaded file to disk"""
+    with open(video_path, "wb") as f:
+        shutil.copyfileobj(source, f)
+
+
+def _find_known_lesson(video_sha256: str = None, video_sampled_hash: str = None) -> Optional[bytes]:
+    """Look up a lesson for a video in the sample library and lesson store, already encoded"""
+    return (sample_library.find_json_by_hash(video_sha256, video_sampled_hash)
+            or lesson_store.find_json_by_video_hash(video_sha256, video_sampled_hash))
+
+
+async def _lesson_for_transcript(transcript: str, video_sha256: str = None, video_sampled_hash: str = None,
+                                 language: dict = None) -> dict:
+    """Reuse or generate (once across all workers) the lesson for a transcript"""
+    # Reuse the lesson of an identical transcript (e.g. a re-encoded upload). Link the
+    # new video to it instead of storing a duplicate, so its next upload is a direct hit.
+    stored = lesson_store.find_by_transcript(transcript)
+    if stored:
+        if video_sha256:
+            lesson_store.link_video(stored["lesson_id"], video_sha256, video_sampled_hash)
+        return stored
+
+    async def generate_and_store() -> dict:
+        # Feed transcription through AI agent to generate lesson plan
+        # Language identified from the audio (see services/language_id) is handed to the agent
+        lesson_plan = await agent_service.generate_lesson_plan(transcript, language["language"] if language else None)
+
+        print(f"Lesson plan generated ({lesson_plan.get('detected_language')}, "
+              f"{lesson_plan.get('proficiency_level')}).")
+
+        lesson_id = lesson_store.save_lesson(transcript, lesson_plan, video_sha256=video_sha256,
+                                             video_sampled_hash=video_sampled_hash)
+        return {
+            "lesson_id": lesson_id,
+            "transcript": transcript,
+            "lesson_plan": lesson_plan
+        }
+
+    return await shared_cache.get_or_compute(
+        f"lesson:{hash_bytes(transcript.encode('utf-8'))}",
+        generate_and_store
+    )
+
+
+@router.post("/check-video")
+async def check_video(request: CheckVideoRequest, http_request: Request):
+    """
+    Ask whether a video is already known before uploading it.
+
+    The client sends the video's full SHA-256 or its sampled hash. On a hit the
+    lesson is returned straight away; a cached transcript for the full hash is
+    turned into a lesson without needing the video. On a miss the client
+    uploads to /process-video as usual.
+
+    Args:
+        request: Contains sha256 and/or sampled_hash
+
+    Returns:
+        {"status": "hit", ...lesson} or {"status": "miss"}
+    """
+    try:
+        if not request.sha256 and not request.sampled_hash:
+            raise HTTPException(
+                status_code=400,
+                detail="sha256 or sampled_hash is required"
+            )
+
+        # Hits are sent as the stored bytes, without decoding the lesson plan
+        known = _find_known_lesson(request.sha256, request.sampled_hash)
+        if known:
+            return JSONBytesResponse(extend_json(known, {"status": "hit"}))
+
+        if request.sha256:
+            transcription = shared_cache.get(f"transcription:{request.sha256}")
+            if transcription and transcription["transcript"]:
+                async def admitted() -> dict:
+                    async with admission.admit("check-video", PRIORITY_NORMAL):
+                        return await _lesson_for_transcript(transcription["transcript"], video_sha256=request.sha256,
+                                                            language=transcription["language"])
+
+                # Generating the lesson is an LLM call; don't spend it on a client that left
+                lesson = await run_until_disconnected(http_request, admitted())
+                return JSONBytesResponse({"status": "hit", **lesson})
+
+        return JSONBytesResponse({"status": "miss"})
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error checking video: {str(e)}")
+
 
 @router.post("/process-video")
-async def process_video_endpoint(video: UploadFile = File(...)):
+async def process_video_endpoint(
+    request: Request,
+    video: UploadFile = File(...),
+    backend: Optional[str] = Form(None),
+    language_codes: Optional[str] = Form(None)
+):
     """
-    Accept a video file, extract audio, transcribe it using Google Speech-to-Text,
-    and feed the transcribed text through the AI Agent.
+    Accept a video file, extract audio, transcribe it using the selected
+    transcription backend, and feed the transcribed text through the AI Agent.
 
     Args:
         video: MP4 video file
+        backend: Transcription backend ('google', 'local' or 'auto'); defaults to TRANSCRIPTION_BACKEND
+        language_codes: Comma-separated BCP-47 codes the audio may be in, e.g. "fr-FR"
 
     Returns:
         Object containing transcription and AI agent response
     """
     video_path = None
+    # Set once the shared transcription owns the temp file and will remove it itself
+    video_handed_off = False
     try:
         # Validate filename extension
         if not video.filename or not video.filename.lower().endswith(('.mp4', '.avi', '.mov', '.mkv', '.webm')):
@@ -35,48 +154,107 @@ async def process_video_endpoint(video: UploadFile = File(...)):
                 detail="Invalid file type. Please upload a video file (mp4, avi, mov, mkv, webm)."
             )
 
+        if backend and backend != "auto" and backend not in BACKENDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"backend must be one of: auto, {', '.join(BACKENDS)}"
+            )
+
+        if backend and backend != "auto" and not BACKENDS[backend].is_available():
+            raise HTTPException(
+                status_code=400,
+                detail=f"The {backend} transcription backend is not available on this server"
+            )
+
+        languages = [code.strip() for code in language_codes.split(",") if code.strip()] if language_codes else None
+
         # Save uploaded video to temporary file
         video_fd, video_path = tempfile.mkstemp(suffix=".mp4")
         os.close(video_fd)
 
-        with open(video_path, "wb") as f:
-            content = await video.read()
-            f.write(content)
+        # Stream to disk rather than holding the whole upload in memory. Copying and
+        # hashing are blocking file I/O, so they run in a thread to keep the loop free.
+        await asyncio.to_thread(_save_upload, video.file, video_path)
 
         print("Video saved to:", video_path)
 
-        # Process video: extract audio and transcribe
-        transcript = await process_video(video_path)
+        video_sha256, video_sampled_hash = await asyncio.gather(
+            asyncio.to_thread(hash_file, video_path),
+            asyncio.to_thread(hash_file_sampled, video_path)
+        )
 
-        print("Transcription:", transcript)
+        # Sample videos and videos seen before are served without reprocessing or re-encoding
+        known = _find_known_lesson(video_sha256)
+        if known:
+            return JSONBytesResponse(known)
 
-        if not transcript:
-            raise HTTPException(
-                status_code=400,
-                detail="No speech detected in the video"
-            )
+        def remove_video():
+            if os.path.exists(video_path):
+                os.remove(video_path)
 
-        # Feed transcription through AI agent to generate lesson plan
-        lesson_plan = await agent_service.generate_lesson_plan(transcript)
+        async def run_pipeline() -> dict:
+            nonlocal video_handed_off
+            # Full video jobs are the most expensive work; they queue behind everything else
+            async with admission.admit("process-video", PRIORITY_LOW):
+                # Process video: extract audio and transcribe. Concurrent uploads of the
+                # same video in any worker share a single transcription.
+                transcription_key = f"transcription:{video_sha256}"
+                if backend or languages:
+                    transcription_key += f":{backend or ''}:{','.join(languages or [])}"
+                # The computation can outlive this request (other waiters keep it alive
+                # after a disconnect), so it removes the video when it is done with it
+                video_handed_off = True
+                transcription = await shared_cache.get_or_compute(
+                    transcription_key,
+                    lambda: process_video(video_path, backend, languages),
+                    release=remove_video
+                )
+                transcript = transcription["transcript"]
 
-        print("Lesson Plan generated.", lesson_plan)
+                print("Transcription:", transcript)
 
-        return {
-            "transcript": transcript,
-            "lesson_plan": lesson_plan
-        }
+                if not transcript:
+                    raise HTTPException(
+                        status_code=400,
+                        detail="No speech detected in the video"
+                    )
+
+                return await _lesson_for_transcript(transcript, video_sha256, video_sampled_hash,
+                                                    transcription["language"])
+
+        # Abort extraction, transcription and LLM calls if the client goes away
+        return JSONBytesResponse(await run_until_disconnected(request, run_pipeline()))
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing video: {str(e)}")
     finally:
-        # Clean up temporary video file
-        if video_path and os.path.exists(video_path):
+        # Clean up temporary video file, unless the transcription has taken it over
+        if video_path and not video_handed_off and os.path.exists(video_path):
             os.remove(video_path)
 
 
+@router.get("/samples/{name}")
+async def get_sample_lesson(name: str):
+    """
+    Serve the pre-generated lesson for a bundled sample video.
+
+    Args:
+        name: File name of the sample video, e.g. "english-sample.mp4"
+
+    Returns:
+        Object containing transcription, lesson plan and pre-generated detail panels
+    """
+    encoded = sample_library.get_sample_json(name)
+    if not encoded:
+        raise HTTPException(status_code=404, detail=f"No pre-generated lesson for {name}")
+
+    # Encoded once when the library loaded; sent as-is
+    return JSONBytesResponse(encoded)
+
+
 @router.post("/generate-examples")
-async def generate_examples(request: GenerateExamplesRequest):
+async def generate_examples(request: GenerateExamplesRequest, http_request: Request):
     """
     Generate detailed information and additional examples for vocabulary or grammar items.
 
@@ -105,14 +283,35 @@ async def generate_examples(request: GenerateExamplesRequest):
                 detail="structure_name is required for grammar items"
             )
 
-        result = await agent_service.generate_detailed_info(
-            item_type=request.item_type,
-            word=request.word or request.structure_name,
-            translation=request.translation,
-            structure_name=request.structure_name
-        )
+        key = request.word if request.item_type == 'vocab' else request.structure_name
+        cached = (sample_library.get_detail(request.item_type, key, request.translation, request.language)
+                  or lesson_store.get_detail(request.item_type, key, request.translation, request.language))
+        if cached:
+            return JSONBytesResponse(cached)
+
+        async def generate_and_store() -> dict:
+            result = await agent_service.generate_detailed_info(
+                item_type=request.item_type,
+                word=request.word or request.structure_name,
+                translation=request.translation,
+                structure_name=request.structure_name
+            )
+            lesson_store.save_detail(request.item_type, key, result, request.translation, request.language)
+            return result
+
+        cache_key = "detail:" + ":".join(detail_key(request.item_type, key, request.translation, request.language))
+        # Cache hits are sent as the stored bytes, without decoding them
+        cached = shared_cache.get_raw(cache_key)
+        if cached:
+            return JSONBytesResponse(cached)
+
+        async def admitted() -> dict:
+            async with admission.admit("generate-examples", PRIORITY_HIGH):
+                return await shared_cache.get_or_compute(cache_key, generate_and_store)
+
+        result = await run_until_disconnected(http_request, admitted())
 
-        return result
+        return JSONBytesResponse(result)
 
     except HTTPException:
         raise
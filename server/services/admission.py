@@ -0,0 +1,253 @@
+import asyncio
+import heapq
+import itertools
+import json
+import math
+import os
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from fastapi import HTTPException
+
+# Lower value = admitted first when a slot frees up
+PRIORITY_HIGH = 0  # cheap LLM calls such as detail panels
+PRIORITY_NORMAL = 1  # single lesson generation / section regeneration
+PRIORITY_LOW = 2  # full video jobs (extraction + transcription + lesson)
+
+DEFAULT_LIMITS = "process-video=2,check-video=2,regenerate=2,generate-examples=6"
+DEFAULT_QUEUE_LIMITS = "process-video=4,check-video=4,regenerate=4,generate-examples=16"
+
+# Upload endpoints checked before their request body is read (see AdmissionGate)
+GATED_PATHS = {"/llm/process-video": "process-video"}
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(500 * 1024 * 1024)))
+
+
+def _parse_limits(value: str) -> dict:
+    """Parse "name=count,name=count" into a dictionary"""
+    limits = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, count = item.split("=", 1)
+            limits[name.strip()] = int(count)
+    return limits
+
+
+class Overloaded(HTTPException):
+    """Raised when a request can't be admitted; rendered as 503 with Retry-After"""
+
+    def __init__(self, endpoint: str, retry_after: int):
+        super().__init__(
+            status_code=503,
+            detail=f"Server is busy ({endpoint}), please retry later",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+class AdmissionController:
+    """
+    Per-process admission control for expensive endpoints.
+
+    Each endpoint has its own concurrency cap and bounded wait queue, and all
+    endpoints share a total number of slots. When a slot frees up it goes to
+    the highest-priority waiter that fits, so cheap work overtakes queued video
+    jobs. Requests are rejected with Overloaded when their queue is full or
+    they have waited longer than max_wait seconds; the Retry-After hint is
+    derived from the endpoint's recent service time.
+    """
+
+    def __init__(self, limits: dict, queue_limits: dict, total_slots: int, max_wait: float):
+        self.limits = limits
+        self.queue_limits = queue_limits
+        self.total_slots = total_slots
+        self.max_wait = max_wait
+        self._active = defaultdict(int)
+        self._active_total = 0
+        self._queued = defaultdict(int)
+        self._uploads = defaultdict(int)
+        self._waiters = []
+        self._seq = itertools.count()
+        self._service_time = {}
+
+    def _can_run(self, endpoint: str) -> bool:
+        return (self._active_total < self.total_slots
+                and self._active[endpoint] < self.limits.get(endpoint, self.total_slots))
+
+    def _grant(self, endpoint: str):
+        self._active[endpoint] += 1
+        self._active_total += 1
+
+    def _release(self, endpoint: str):
+        self._active[endpoint] -= 1
+        self._active_total -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self):
+        """Hand free slots to waiters in priority order"""
+        blocked = []
+        while self._waiters and self._active_total < self.total_slots:
+            waiter = heapq.heappop(self._waiters)
+            _, _, endpoint, future = waiter
+            if future.done():
+                continue  # timed out or cancelled
+            if self._can_run(endpoint):
+                self._queued[endpoint] -= 1
+                self._grant(endpoint)
+                future.set_result(None)
+            else:
+                blocked.append(waiter)
+        for waiter in blocked:
+            heapq.heappush(self._waiters, waiter)
+
+    def retry_after(self, endpoint: str) -> int:
+        """
+        Estimate how long a rejected client should wait before retrying.
+
+        Args:
+            endpoint: Endpoint name
+
+        Returns:
+            Seconds, at least 1
+        """
+        service_time = self._service_time.get(endpoint, 5.0)
+        limit = max(1, self.limits.get(endpoint, self.total_slots))
+        return max(1, math.ceil(service_time * (self._queued[endpoint] + 1) / limit))
+
+    def _record(self, endpoint: str, elapsed: float):
+        """Exponentially weighted moving average of service time"""
+        previous = self._service_time.get(endpoint)
+        self._service_time[endpoint] = elapsed if previous is None else 0.8 * previous + 0.2 * elapsed
+
+    @asynccontextmanager
+    async def admit(self, endpoint: str, priority: int = PRIORITY_NORMAL):
+        """
+        Hold a slot for endpoint while the block runs.
+
+        Args:
+            endpoint: Endpoint name, e.g. "process-video"
+            priority: PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW
+
+        Raises:
+            Overloaded: The endpoint's queue is full or the wait timed out
+        """
+        if self._can_run(endpoint):
+            self._grant(endpoint)
+        else:
+            if self._queued[endpoint] >= self.queue_limits.get(endpoint, 0):
+                raise Overloaded(endpoint, self.retry_after(endpoint))
+
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._seq), endpoint, future))
+            self._queued[endpoint] += 1
+            try:
+                await asyncio.wait_for(future, self.max_wait)
+            except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+                if future.done() and not future.cancelled():
+                    # Granted just as we gave up: hand the slot back
+                    self._release(endpoint)
+                else:
+                    self._queued[endpoint] -= 1
+                if isinstance(e, asyncio.TimeoutError):
+                    raise Overloaded(endpoint, self.retry_after(endpoint))
+                raise
+
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._record(endpoint, time.monotonic() - start)
+            self._release(endpoint)
+
+    def reserve_upload(self, endpoint: str) -> bool:
+        """
+        Take an upload ticket for endpoint before its request body is read.
+
+        Uploads are spooled to disk before the route reaches admit(), so the
+        number of uploads in progress is capped separately at the endpoint's
+        concurrency cap plus its queue limit. Every ticket taken must be given
+        back with release_upload().
+
+        Args:
+            endpoint: Endpoint name
+
+        Returns:
+            False when the upload would be rejected straight away
+        """
+        capacity = self.limits.get(endpoint, self.total_slots) + self.queue_limits.get(endpoint, 0)
+        if self._uploads[endpoint] >= capacity:
+            return False
+        self._uploads[endpoint] += 1
+        return True
+
+    def release_upload(self, endpoint: str):
+        """Give back a ticket taken by reserve_upload()"""
+        self._uploads[endpoint] -= 1
+
+    def snapshot(self) -> dict:
+        """Current active and queued counts per endpoint"""
+        return {
+            "active": dict(self._active),
+            "queued": dict(self._queued),
+            "uploads": dict(self._uploads),
+            "total_slots": self.total_slots
+        }
+
+
+# Global instance (limits apply per worker process)
+admission = AdmissionController(
+    limits=_parse_limits(os.getenv("ADMISSION_LIMITS", DEFAULT_LIMITS)),
+    queue_limits=_parse_limits(os.getenv("ADMISSION_QUEUE_LIMITS", DEFAULT_QUEUE_LIMITS)),
+    total_slots=int(os.getenv("ADMISSION_TOTAL_SLOTS", "8")),
+    max_wait=float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", "60"))
+)
+
+
+class AdmissionGate:
+    """
+    ASGI middleware rejecting upload requests before their body is read.
+
+    Starlette spools a multipart body to disk while parsing it, before the
+    route runs, so admit() alone can't stop a burst of uploads from filling
+    the disk. For the paths in GATED_PATHS this checks the declared
+    Content-Length and takes an upload ticket (reserve_upload()) first,
+    answering 413 or 503 (with Retry-After) without reading the body. The
+    ticket is held until the response has been sent.
+    """
+
+    def __init__(self, app, controller: AdmissionController = None):
+        self.app = app
+        self.controller = controller or admission
+
+    async def __call__(self, scope, receive, send):
+        endpoint = GATED_PATHS.get(scope.get("path")) if scope["type"] == "http" else None
+        if endpoint is None or scope.get("method") != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = None
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    content_length = int(value)
+                except ValueError:
+                    pass
+                break
+
+        if content_length is not None and content_length > MAX_UPLOAD_BYTES:
+            await _send_error(send, 413, f"Upload too large (limit {MAX_UPLOAD_BYTES} bytes)")
+        elif not self.controller.reserve_upload(endpoint):
+            await _send_error(send, 503, f"Server is busy ({endpoint}), please retry later",
+                              {"Retry-After": str(self.controller.retry_after(endpoint))})
+        else:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                self.controller.release_upload(endpoint)
+
+
+async def _send_error(send, status: int, detail: str, headers: dict = None):
+    """Send a JSON error response shaped like FastAPI's HTTPException responses"""
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    raw_headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode("ascii"))]
+    raw_headers += [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in (headers or {}).items()]
+    await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": body})
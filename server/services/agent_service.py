@@ -1,5 +1,6 @@
 import sys
 import os
+import hashlib
 from pathlib import Path
 
 # Add the agent directory to the path
@@ -9,92 +10,13 @@ if str(agent_dir) not in sys.path:
     sys.path.insert(0, str(agent_dir))
 
 # Import agent modules - these will use the agent's config.py
-from lesson_agent import LanguageLearningAgent, LessonPlan
+from lesson_agent import LanguageLearningAgent, LessonPlan, SECTIONS, SYSTEM_PROMPT, USER_PROMPT, LANGUAGE_HINT_PROMPT
+from config import config
+from langchain.output_parsers import PydanticOutputParser
 
 
-class AgentService:
-    """Service to interact with the Language Learning Agent"""
-
-    def __init__(self):
-        self.agent = None
-
-    def _get_agent(self) -> LanguageLearningAgent:
-        """Lazy load the agent"""
-        if self.agent is None:
-            self.agent = LanguageLearningAgent()
-        return self.agent
-
-    async def generate_lesson_plan(self, transcript: str) -> dict:
-        """
-        Generate a lesson plan from a transcript.
-
-        Args:
-            transcript: The transcribed text from the video
-
-        Returns:
-            Dictionary containing the lesson plan
-        """
-        try:
-            agent = self._get_agent()
-            lesson_plan: LessonPlan = agent.generate_lesson_plan(transcript)
-
-            # Convert to dictionary for JSON response
-            return {
-                "detected_language": lesson_plan.detected_language,
-                "proficiency_level": lesson_plan.proficiency_level,
-                "summary": lesson_plan.summary,
-                "vocabulary_words": [
-                    {
-                        "word": word.word,
-                        "translation": word.translation,
-                        "definition": word.definition,
-                        "example_sentence": word.example_sentence
-                    }
-                    for word in lesson_plan.vocabulary_words
-                ],
-                "sentence_structures": [
-                    {
-                        "structure_name": structure.structure_name,
-                        "explanation": structure.explanation,
-                        "example_from_text": structure.example_from_text,
-                        "practice_template": structure.practice_template
-                    }
-                    for structure in lesson_plan.sentence_structures
-                ],
-                "learning_objectives": lesson_plan.learning_objectives,
-                "comprehension_questions": [
-                    {
-                        "question": q.question,
-                        "question_type": q.question_type,
-                        "correct_answer": q.correct_answer,
-                        "options": q.options,
-                        "explanation": q.explanation
-                    }
-                    for q in lesson_plan.comprehension_questions
-                ]
-            }
-        except Exception as e:
-            raise Exception(f"Error generating lesson plan: {str(e)}")
-
-    async def generate_detailed_info(self, item_type: str, word: str, translation: str = None,
-                                     structure_name: str = None) -> dict:
-        """
-        Generate detailed information and additional examples for vocabulary or grammar.
-
-        Args:
-            item_type: Either 'vocab' or 'grammar'
-            word: The vocabulary word (for vocab) or structure name (for grammar)
-            translation: Translation of the word (for vocab only)
-            structure_name: Name of the grammar structure (for grammar only)
-
-        Returns:
-            Dictionary containing detailed description and examples
-        """
-        try:
-            agent = self._get_agent()
-
-            if item_type == 'vocab':
-                prompt = f"""Provide a detailed linguistic analysis of the word "{word}" ({translation}).
+# Prompt templates for the "more examples" detail panels
+VOCAB_DETAIL_PROMPT = """Provide a detailed linguistic analysis of the word "{word}" ({translation}).
 
 Include:
 1. A deeper description covering:
@@ -120,8 +42,7 @@ EXAMPLES:
 4. [Example sentence 4]
 5. [Example sentence 5]"""
 
-            else:  # grammar
-                prompt = f"""Provide a comprehensive explanation of the grammar structure "{structure_name}".
+GRAMMAR_DETAIL_PROMPT = """Provide a comprehensive explanation of the grammar structure "{structure_name}".
 
 Include:
 1. A deeper description covering:
@@ -148,10 +69,121 @@ EXAMPLES:
 4. [Example sentence 4]
 5. [Example sentence 5]"""
 
+
+class AgentService:
+    """Service to interact with the Language Learning Agent"""
+
+    def __init__(self):
+        self.agent = None
+
+    def _get_agent(self) -> LanguageLearningAgent:
+        """Lazy load the agent"""
+        if self.agent is None:
+            self.agent = LanguageLearningAgent()
+        return self.agent
+
+    def warm_up(self):
+        """Build the agent ahead of the first request so workers start hot"""
+        try:
+            self._get_agent()
+        except ValueError as e:
+            print(f"Agent not preloaded: {e}")
+
+    def prompt_fingerprint(self) -> str:
+        """
+        Fingerprint of everything that shapes generated output: prompt templates,
+        the format instructions derived from the LessonPlan schema, model name
+        and temperature. Used to detect stale pre-generated lessons.
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        digest = hashlib.sha256()
+        # Filled into SYSTEM_PROMPT, so schema edits (e.g. Field descriptions) change the prompt too
+        format_instructions = PydanticOutputParser(pydantic_object=LessonPlan).get_format_instructions()
+        for part in (SYSTEM_PROMPT, USER_PROMPT, LANGUAGE_HINT_PROMPT, format_instructions, VOCAB_DETAIL_PROMPT,
+                     GRAMMAR_DETAIL_PROMPT, config.MODEL_NAME, str(config.TEMPERATURE)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    async def generate_lesson_plan(self, transcript: str, language: str = None) -> dict:
+        """
+        Generate a lesson plan from a transcript.
+
+        Args:
+            transcript: The transcribed text from the video
+            language: Language identified from the audio, used as detected_language if given
+
+        Returns:
+            Dictionary containing the lesson plan
+        """
+        try:
+            agent = self._get_agent()
+            lesson_plan: LessonPlan = await agent.agenerate_lesson_plan(transcript, language)
+
+            return lesson_plan.model_dump()
+        except Exception as e:
+            raise Exception(f"Error generating lesson plan: {str(e)}")
+
+    def regenerable_sections(self) -> tuple:
+        """
+        Lesson plan sections that regenerate_section accepts.
+
+        Returns:
+            Section names, e.g. ('vocabulary_words', 'sentence_structures', ...)
+        """
+        return tuple(SECTIONS)
+
+    async def regenerate_section(self, transcript: str, lesson_plan: dict, section: str,
+                                 instructions: str = "") -> dict:
+        """
+        Regenerate a single section of an existing lesson plan.
+
+        Args:
+            transcript: The transcribed text the lesson was generated from
+            lesson_plan: The existing lesson plan dictionary
+            section: One of regenerable_sections()
+            instructions: Optional teacher instructions for the new section
+
+        Returns:
+            Dictionary containing the updated lesson plan
+        """
+        try:
+            agent = self._get_agent()
+            updated: LessonPlan = await agent.aregenerate_section(
+                transcript, LessonPlan.model_validate(lesson_plan), section, instructions
+            )
+            return updated.model_dump()
+        except Exception as e:
+            raise Exception(f"Error regenerating {section}: {str(e)}")
+
+    async def generate_detailed_info(self, item_type: str, word: str, translation: str = None,
+                                     structure_name: str = None) -> dict:
+        """
+        Generate detailed information and additional examples for vocabulary or grammar.
+
+        Args:
+            item_type: Either 'vocab' or 'grammar'
+            word: The vocabulary word (for vocab) or structure name (for grammar)
+            translation: Translation of the word (for vocab only)
+            structure_name: Name of the grammar structure (for grammar only)
+
+        Returns:
+            Dictionary containing detailed description and examples
+        """
+        try:
+            agent = self._get_agent()
+
+            if item_type == 'vocab':
+                prompt = VOCAB_DETAIL_PROMPT.format(word=word, translation=translation)
+            else:  # grammar
+                prompt = GRAMMAR_DETAIL_PROMPT.format(structure_name=structure_name)
+
             # Use the agent's LLM to generate the response
             from langchain_core.messages import HumanMessage
 
-            response = agent.llm.invoke([HumanMessage(content=prompt)])
+            response = await agent.llm.ainvoke([HumanMessage(content=prompt)])
             content = response.content
 
             # Parse the response
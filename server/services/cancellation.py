@@ -0,0 +1,62 @@
+import asyncio
+from typing import Any, Awaitable
+from fastapi import HTTPException, Request
+
+DISCONNECT_POLL_SECONDS = 0.5
+
+# Requests abandoned because the client went away
+stats = {"disconnected": 0}
+
+
+class ClientDisconnected(HTTPException):
+    """Raised when the client closes the connection before the response is ready"""
+
+    def __init__(self):
+        # 499 "Client Closed Request"; nobody reads it, but it shows up in access logs
+        super().__init__(status_code=499, detail="Client closed request")
+
+
+async def _wait_for_disconnect(request: Request):
+    while not await request.is_disconnected():
+        await asyncio.sleep(DISCONNECT_POLL_SECONDS)
+
+
+async def run_until_disconnected(request: Request, work: Awaitable[Any]) -> Any:
+    """
+    Run work, cancelling it as soon as the client disconnects.
+
+    Cancellation propagates through the pipeline: ffmpeg is killed, pending
+    Speech and LLM calls are aborted and temporary files are removed by the
+    usual cleanup paths. Work coalesced with other live requests keeps running
+    for them (see SharedCache.get_or_compute).
+
+    Args:
+        request: The incoming request
+        work: Coroutine producing the response
+
+    Returns:
+        The result of work
+
+    Raises:
+        ClientDisconnected: The client went away first
+    """
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        # Also covers this handler itself being cancelled (e.g. server shutdown)
+        watcher.cancel()
+        if not task.done():
+            task.cancel()
+
+    if task.done() and not task.cancelled():
+        return task.result()
+
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    stats["disconnected"] += 1
+    print("Client disconnected; cancelled in-flight work")
+    raise ClientDisconnected()
@@ -0,0 +1,144 @@
+import gzip
+import os
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # optional dependency; gzip is always available
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed (the headers would cost more than they save)
+MIN_SIZE = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+def _accepted_encodings(header: str) -> dict:
+    """Parse an Accept-Encoding header into {encoding: q}"""
+    accepted = {}
+    for item in header.split(","):
+        parts = item.strip().split(";")
+        name = parts[0].strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in parts[1:]:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[name] = q
+    return accepted
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the response encoding for a client.
+
+    Brotli is preferred over gzip at equal preference when the brotli package
+    is installed; encodings with q=0 are never chosen.
+
+    Args:
+        accept_encoding: Value of the request's Accept-Encoding header
+
+    Returns:
+        "br", "gzip" or None for an uncompressed response
+    """
+    accepted = _accepted_encodings(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+
+    best, best_q = None, 0.0
+    for encoding in candidates:
+        q = accepted.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Compress a response body.
+
+    Args:
+        body: Uncompressed bytes
+        encoding: "br" or "gzip"
+
+    Returns:
+        Compressed bytes
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing JSON and text responses with brotli or gzip.
+
+    The encoding is negotiated per request from Accept-Encoding. Only complete
+    (non-streaming) bodies of at least MIN_SIZE bytes are compressed; streamed
+    responses and responses that already carry a Content-Encoding pass through
+    untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Hold the headers until we know whether the body gets compressed
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            headers = [(name, value) for name, value in start.get("headers", [])]
+            header_map = {name.lower(): value for name, value in headers}
+            content_type = header_map.get(b"content-type", b"").decode("latin-1")
+            body = message.get("body", b"")
+
+            compressible = (
+                not message.get("more_body", False)
+                and b"content-encoding" not in header_map
+                and len(body) >= MIN_SIZE
+                and content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            if compressible:
+                body = compress(body, encoding)
+                headers = [(name, value) for name, value in headers if name.lower() != b"content-length"]
+                headers += [
+                    (b"content-encoding", encoding.encode("ascii")),
+                    (b"content-length", str(len(body)).encode("ascii")),
+                ]
+                message = {**message, "body": body}
+            headers.append((b"vary", b"Accept-Encoding"))
+
+            await send({**start, "headers": headers})
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,75 @@
+import hashlib
+import os
+
+
+def hash_bytes(data: bytes) -> str:
+    """
+    Compute the SHA-256 content hash of an in-memory payload.
+
+    Args:
+        data: Raw bytes
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compute the SHA-256 content hash of a file without loading it all into memory.
+
+    Args:
+        path: Path to the file
+        chunk_size: Number of bytes read per iteration
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Sampled hashing reads three fixed-size chunks instead of the whole file. The
+# browser implements the same scheme (client-safe/src/videoHash.ts) so it can
+# ask whether a video is already known before uploading it.
+SAMPLE_CHUNK_SIZE = 64 * 1024
+
+
+def _sample_offsets(size: int) -> list:
+    """Start offsets of the chunks included in a sampled hash"""
+    if size <= 3 * SAMPLE_CHUNK_SIZE:
+        return [0]
+    middle = size // 2 - SAMPLE_CHUNK_SIZE // 2
+    return [0, middle, size - SAMPLE_CHUNK_SIZE]
+
+
+def hash_file_sampled(path: str) -> str:
+    """
+    Compute a fast sampled hash: SHA-256 over the file size and its first,
+    middle and last 64 KiB (the whole file when it is smaller than 192 KiB).
+
+    Cheap enough to compute in the browser before uploading. Paired with the
+    size it identifies a video with high probability, but unlike hash_file it
+    is not collision resistant against crafted files.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    size = os.path.getsize(path)
+    digest = hashlib.sha256(f"{size}:".encode("ascii"))
+    with open(path, "rb") as f:
+        offsets = _sample_offsets(size)
+        if offsets == [0]:
+            digest.update(f.read())
+        else:
+            for offset in offsets:
+                f.seek(offset)
+                digest.update(f.read(SAMPLE_CHUNK_SIZE))
+    return digest.hexdigest()
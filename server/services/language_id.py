@@ -0,0 +1,142 @@
+import asyncio
+import os
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LANGUAGE_ID_ENABLED = os.getenv("LANGUAGE_ID_ENABLED", "true").lower() not in ("0", "false", "no")
+# Seconds of audio cut out during extraction for identification (Whisper looks at 30s at most)
+LANGUAGE_ID_SAMPLE_SECONDS = float(os.getenv("LANGUAGE_ID_SAMPLE_SECONDS", "20"))
+# Below this probability the guess is ignored and the recognizer keeps its candidate list
+LANGUAGE_ID_MIN_PROBABILITY = float(os.getenv("LANGUAGE_ID_MIN_PROBABILITY", "0.6"))
+
+# ISO 639-1 code -> (recognizer locale, language name given to the lesson agent)
+LANGUAGES = {
+    "ar": ("ar-EG", "Arabic"),
+    "de": ("de-DE", "German"),
+    "en": ("en-US", "English"),
+    "es": ("es-ES", "Spanish"),
+    "fr": ("fr-FR", "French"),
+    "hi": ("hi-IN", "Hindi"),
+    "it": ("it-IT", "Italian"),
+    "ja": ("ja-JP", "Japanese"),
+    "ko": ("ko-KR", "Korean"),
+    "nl": ("nl-NL", "Dutch"),
+    "pl": ("pl-PL", "Polish"),
+    "pt": ("pt-BR", "Portuguese"),
+    "ru": ("ru-RU", "Russian"),
+    "tr": ("tr-TR", "Turkish"),
+    "zh": ("cmn-Hans-CN", "Chinese"),
+}
+
+# Locale language subtags that differ from the ISO 639-1 code Whisper expects
+_SUBTAG_ISO_CODES = {"cmn": "zh", "yue": "zh", "fil": "tl", "iw": "he", "nb": "no"}
+
+
+def iso_code(language_code: str) -> str:
+    """
+    Map a recognizer locale to the ISO 639-1 code Whisper uses.
+
+    Args:
+        language_code: BCP-47 code, e.g. "fr-CA" or "cmn-Hans-CN"
+
+    Returns:
+        ISO 639-1 code, e.g. "fr" or "zh"
+    """
+    subtag = language_code.split("-")[0].lower()
+    return _SUBTAG_ISO_CODES.get(subtag, subtag)
+
+
+class LanguageIdentifier:
+    """
+    Spoken-language identification on a short audio sample (optional dependency).
+
+    Uses faster-whisper's language detector, which only runs the encoder over
+    the first 30 seconds, so a small model ("tiny" by default, configurable
+    through LANGUAGE_ID_MODEL) identifies a clip in a fraction of the time a
+    full transcription takes. Disabled with LANGUAGE_ID_ENABLED=false.
+    """
+
+    def __init__(self):
+        self.model = None
+        self.model_size = os.getenv("LANGUAGE_ID_MODEL", "tiny")
+        self.compute_type = os.getenv("LOCAL_WHISPER_COMPUTE_TYPE", "int8")
+
+    def is_available(self) -> bool:
+        if not LANGUAGE_ID_ENABLED:
+            return False
+        try:
+            import faster_whisper  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def warm_up(self):
+        """Load the model ahead of the first request, or warn that identification is off"""
+        if not LANGUAGE_ID_ENABLED:
+            return
+        if not self.is_available():
+            print("WARNING: faster-whisper is not installed, so spoken-language identification is off; "
+                  "uploads are recognized against TRANSCRIPTION_LANGUAGES only")
+            return
+        try:
+            self._get_model()
+        except Exception as e:
+            print(f"WARNING: language identification model not preloaded: {e}")
+
+    def _get_model(self):
+        """Lazy load the Whisper model"""
+        if self.model is None:
+            from faster_whisper import WhisperModel
+            self.model = WhisperModel(self.model_size, device="cpu", compute_type=self.compute_type)
+        return self.model
+
+    def _language_probabilities(self, sample_path: str) -> dict:
+        # transcribe() detects the language eagerly; the segment generator is never consumed
+        _, info = self._get_model().transcribe(sample_path, beam_size=1)
+        probabilities = dict(info.all_language_probs or [])
+        probabilities.setdefault(info.language, info.language_probability)
+        return probabilities
+
+    async def identify(self, sample_path: str, candidates: Optional[List[str]] = None) -> Optional[dict]:
+        """
+        Identify the spoken language of an audio sample.
+
+        Args:
+            sample_path: Path to a short WAV sample
+            candidates: BCP-47 codes to choose between; any supported language if omitted
+
+        Returns:
+            Dictionary with language_code (recognizer locale), language (name),
+            and probability, or None when unavailable or not confident enough
+        """
+        if not self.is_available():
+            return None
+
+        probabilities = await asyncio.to_thread(self._language_probabilities, sample_path)
+
+        if candidates:
+            # Keep the caller's locale (e.g. "fr-CA") for whichever candidate wins
+            options = {iso_code(code): code for code in candidates}
+        else:
+            options = {iso: locale for iso, (locale, _) in LANGUAGES.items()}
+
+        scored = [(probabilities.get(iso, 0.0), iso) for iso in options]
+        if not scored:
+            return None
+        probability, iso = max(scored)
+        if probability < LANGUAGE_ID_MIN_PROBABILITY:
+            print(f"Language ID not confident enough ({iso}: {probability:.2f})")
+            return None
+
+        return {
+            "language_code": options[iso],
+            "language": LANGUAGES.get(iso, (None, iso))[1],
+            "probability": round(probability, 3)
+        }
+
+
+# Global instance
+language_identifier = LanguageIdentifier()
@@ -0,0 +1,675 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import List, Optional
+
+from services.content_hash import hash_bytes
+from services.serialization import dumps, lesson_json, loads
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "lingua.db"
+
+# Leading articles dropped when building lemma keys, per language. Prepositions
+# are kept: "de nuevo" (again) and "a menudo" (often) are not "nuevo" and "menudo".
+_ARTICLES = {
+    "es": {"el", "la", "los", "las", "un", "una", "unos", "unas"},
+    "fr": {"le", "la", "les", "l", "un", "une", "des", "du"},
+    "en": {"the", "a", "an"},
+}
+# For text of unknown language "a" is kept, since it is also a Spanish and French preposition
+_ANY_LANGUAGE_ARTICLES = set().union(*_ARTICLES.values()) - {"a"}
+
+_LANGUAGE_ALIASES = {
+    "spanish": "es", "español": "es", "espanol": "es", "castellano": "es",
+    "french": "fr", "français": "fr", "francais": "fr",
+    "english": "en",
+    "arabic": "ar", "chinese": "zh", "mandarin": "zh", "dutch": "nl", "german": "de", "hindi": "hi",
+    "italian": "it", "japanese": "ja", "korean": "ko", "polish": "pl", "portuguese": "pt",
+    "russian": "ru", "turkish": "tr",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS lessons (
+    id INTEGER PRIMARY KEY,
+    video_sha256 TEXT,
+    video_sampled_hash TEXT,
+    transcript_sha256 TEXT NOT NULL,
+    detected_language TEXT,
+    language_key TEXT NOT NULL DEFAULT '',
+    proficiency_level TEXT,
+    summary TEXT,
+    transcript TEXT NOT NULL,
+    lesson_plan TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_lessons_video ON lessons(video_sha256);
+CREATE INDEX IF NOT EXISTS idx_lessons_video_sampled ON lessons(video_sampled_hash);
+CREATE INDEX IF NOT EXISTS idx_lessons_transcript ON lessons(transcript_sha256);
+CREATE INDEX IF NOT EXISTS idx_lessons_language ON lessons(language_key, id);
+
+-- Further videos (e.g. re-encoded uploads) whose transcript matched an existing lesson
+CREATE TABLE IF NOT EXISTS lesson_videos (
+    video_sha256 TEXT PRIMARY KEY,
+    video_sampled_hash TEXT,
+    lesson_id INTEGER NOT NULL REFERENCES lessons(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_lesson_videos_sampled ON lesson_videos(video_sampled_hash);
+
+CREATE TABLE IF NOT EXISTS vocabulary (
+    id INTEGER PRIMARY KEY,
+    lesson_id INTEGER NOT NULL REFERENCES lessons(id) ON DELETE CASCADE,
+    language TEXT,
+    lemma TEXT NOT NULL,
+    word TEXT NOT NULL,
+    translation TEXT,
+    definition TEXT,
+    example_sentence TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_vocabulary_lemma ON vocabulary(lemma, language);
+CREATE INDEX IF NOT EXISTS idx_vocabulary_lesson ON vocabulary(lesson_id);
+
+CREATE TABLE IF NOT EXISTS structures (
+    id INTEGER PRIMARY KEY,
+    lesson_id INTEGER NOT NULL REFERENCES lessons(id) ON DELETE CASCADE,
+    language TEXT,
+    lemma TEXT NOT NULL,
+    structure_name TEXT NOT NULL,
+    explanation TEXT,
+    example_from_text TEXT,
+    practice_template TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_structures_lemma ON structures(lemma, language);
+CREATE INDEX IF NOT EXISTS idx_structures_lesson ON structures(lesson_id);
+
+CREATE TABLE IF NOT EXISTS details (
+    item_type TEXT NOT NULL,
+    lemma TEXT NOT NULL,
+    qualifier TEXT NOT NULL DEFAULT '',
+    language TEXT NOT NULL DEFAULT '',
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (item_type, lemma, qualifier, language)
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS lessons_fts USING fts5(
+    summary, transcript, content='lessons', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS vocabulary_fts USING fts5(
+    word, translation, definition, content='vocabulary', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS structures_fts USING fts5(
+    structure_name, explanation, content='structures', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+);
+"""
+
+
+def language_key(language: Optional[str]) -> str:
+    """
+    Normalize a language name or code ("Spanish", "es-ES") to a short key.
+
+    Args:
+        language: Language name as detected by the agent, or a BCP-47 code
+
+    Returns:
+        ISO 639-1 code for known languages, otherwise the lowercased first word
+    """
+    words = re.findall(r"\w+", (language or "").lower())
+    if not words:
+        return ""
+    return _LANGUAGE_ALIASES.get(words[0], words[0])
+
+
+def normalize_lemma(text: str, language: Optional[str] = None) -> str:
+    """
+    Build a lemma key for a vocabulary word or structure name.
+
+    This is a lightweight normalization rather than full morphological
+    lemmatization: accents and punctuation are stripped, text is lowercased
+    and a leading article of the given language is dropped, so "El Gato",
+    "el gato" and "gato" share one key.
+
+    Args:
+        text: Word, phrase or structure name
+        language: Language of the text (name or code), if known
+
+    Returns:
+        Normalized key
+    """
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    tokens = re.findall(r"\w+", text)
+    articles = _ARTICLES.get(language_key(language), _ANY_LANGUAGE_ARTICLES)
+    if len(tokens) > 1 and tokens[0] in articles:
+        tokens = tokens[1:]
+    return " ".join(tokens)
+
+
+def detail_key(item_type: str, word: str, translation: Optional[str] = None, language: Optional[str] = None) -> tuple:
+    """
+    Key under which a detail panel is stored and looked up.
+
+    Vocabulary panels are qualified by their translation so homographs
+    ("banco" = "bench" / "bank") get separate panels, and every panel by the
+    lesson's language so e.g. a "Present Perfect" explanation written for an
+    English lesson isn't served to a Spanish one.
+
+    Args:
+        item_type: Either 'vocab' or 'grammar'
+        word: The vocabulary word (for vocab) or structure name (for grammar)
+        translation: Translation of the word (for vocab only)
+        language: Language of the lesson the item comes from
+
+    Returns:
+        Tuple of (item_type, lemma, qualifier, language)
+    """
+    return (item_type, normalize_lemma(word, language), normalize_lemma(translation or "", "en"),
+            language_key(language))
+
+
+def _fts_query(query: str) -> str:
+    """Turn free text into an FTS5 prefix query, ignoring FTS operators"""
+    terms = re.findall(r"\w+", query or "")
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+class LessonStore:
+    """
+    SQLite-backed store for transcripts, lesson plans and detail panels.
+
+    Vocabulary words and sentence structures are denormalized into their own
+    tables with lemma indexes and FTS5 full-text indexes, so stored lessons can
+    be listed, searched and re-served without any LLM call.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = str(db_path or os.getenv("LESSON_STORE_PATH", DEFAULT_DB_PATH))
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Lazy open the database and create the schema"""
+        if self._conn is None:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def connect(self):
+        """Open the database ahead of the first request"""
+        with self._lock:
+            self._get_conn()
+
+    def close(self):
+        """Close the database handle"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def _lesson_from_row(row: sqlite3.Row) -> dict:
+        return {
+            "lesson_id": row["id"],
+            "transcript": row["transcript"],
+            "lesson_plan": loads(row["lesson_plan"])
+        }
+
+    def save_lesson(self, transcript: str, lesson_plan: dict, video_sha256: Optional[str] = None,
+                    video_sampled_hash: Optional[str] = None) -> int:
+        """
+        Store a transcript and its lesson plan, indexing vocabulary and structures.
+
+        Args:
+            transcript: The transcribed text
+            lesson_plan: Lesson plan dictionary as returned by AgentService
+            video_sha256: Content hash of the source video, if known
+            video_sampled_hash: Sampled hash of the source video, if known
+
+        Returns:
+            ID of the stored lesson
+        """
+        language = lesson_plan.get("detected_language")
+        with self._lock:
+            conn = self._get_conn()
+            with conn:
+                cur = conn.execute(
+                    "INSERT INTO lessons (video_sha256, video_sampled_hash, transcript_sha256, detected_language,"
+                    " language_key, proficiency_level, summary, transcript, lesson_plan, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (video_sha256, video_sampled_hash, hash_bytes(transcript.encode("utf-8")), language,
+                     language_key(language), lesson_plan.get("proficiency_level"), lesson_plan.get("summary"), transcript,
+                     dumps(lesson_plan).decode("utf-8"), time.time())
+                )
+                lesson_id = cur.lastrowid
+                conn.execute(
+                    "INSERT INTO lessons_fts (rowid, summary, transcript) VALUES (?, ?, ?)",
+                    (lesson_id, lesson_plan.get("summary"), transcript)
+                )
+                self._index_sections(conn, lesson_id, language_key(language), lesson_plan)
+        return lesson_id
+
+    def update_lesson_plan(self, lesson_id: int, lesson_plan: dict) -> bool:
+        """
+        Replace the lesson plan of a stored lesson and re-index its vocabulary and structures.
+
+        Args:
+            lesson_id: ID of the stored lesson
+            lesson_plan: The new lesson plan dictionary
+
+        Returns:
+            True if the lesson existed and was updated
+        """
+        with self._lock:
+            conn = self._get_conn()
+            with conn:
+                row = conn.execute("SELECT summary, transcript FROM lessons WHERE id = ?", (lesson_id,)).fetchone()
+                if not row:
+                    return False
+                self._replace_plan(conn, lesson_id, row, lesson_plan)
+        return True
+
+    def update_section(self, lesson_id: int, section: str, value) -> Optional[dict]:
+        """
+        Replace one section of a stored lesson plan, keeping the stored values of the others.
+
+        The plan is re-read inside the write transaction, so two regenerations of
+        different sections of the same lesson don't overwrite each other.
+
+        Args:
+            lesson_id: ID of the stored lesson
+            section: Lesson plan key, e.g. 'vocabulary_words'
+            value: The new value of that section
+
+        Returns:
+            The updated lesson plan, or None if the lesson doesn't exist
+        """
+        with self._lock:
+            conn = self._get_conn()
+            with conn:
+                # Take the write lock before reading, so another worker can't update in between
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT summary, transcript, lesson_plan FROM lessons WHERE id = ?", (lesson_id,)
+                ).fetchone()
+                if not row:
+                    return None
+                lesson_plan = loads(row["lesson_plan"])
+                lesson_plan[section] = value
+                self._replace_plan(conn, lesson_id, row, lesson_plan)
+        return lesson_plan
+
+    def _replace_plan(self, conn: sqlite3.Connection, lesson_id: int, row: sqlite3.Row, lesson_plan: dict):
+        """Write a new lesson plan and re-index it; row holds the stored summary and transcript"""
+        language = lesson_plan.get("detected_language")
+
+        # External-content FTS tables need the old values to remove entries
+        conn.execute(
+            "INSERT INTO vocabulary_fts (vocabulary_fts, rowid, word, translation, definition)"
+            " SELECT 'delete', id, word, translation, definition FROM vocabulary WHERE lesson_id = ?",
+            (lesson_id,)
+        )
+        conn.execute(
+            "INSERT INTO structures_fts (structures_fts, rowid, structure_name, explanation)"
+            " SELECT 'delete', id, structure_name, explanation FROM structures WHERE lesson_id = ?",
+            (lesson_id,)
+        )
+        conn.execute(
+            "INSERT INTO lessons_fts (lessons_fts, rowid, summary, transcript) VALUES ('delete', ?, ?, ?)",
+            (lesson_id, row["summary"], row["transcript"])
+        )
+        conn.execute("DELETE FROM vocabulary WHERE lesson_id = ?", (lesson_id,))
+        conn.execute("DELETE FROM structures WHERE lesson_id = ?", (lesson_id,))
+
+        conn.execute(
+            "UPDATE lessons SET detected_language = ?, language_key = ?, proficiency_level = ?, summary = ?,"
+            " lesson_plan = ? WHERE id = ?",
+            (language, language_key(language), lesson_plan.get("proficiency_level"), lesson_plan.get("summary"),
+             dumps(lesson_plan).decode("utf-8"), lesson_id)
+        )
+        conn.execute(
+            "INSERT INTO lessons_fts (rowid, summary, transcript) VALUES (?, ?, ?)",
+            (lesson_id, lesson_plan.get("summary"), row["transcript"])
+        )
+        self._index_sections(conn, lesson_id, language_key(language), lesson_plan)
+
+    @staticmethod
+    def _index_sections(conn: sqlite3.Connection, lesson_id: int, language: str, lesson_plan: dict):
+        """Insert vocabulary and structure rows plus their full-text entries; language is a language_key()"""
+        for word in lesson_plan.get("vocabulary_words", []):
+            cur = conn.execute(
+                "INSERT INTO vocabulary (lesson_id, language, lemma, word, translation, definition, example_sentence)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (lesson_id, language, normalize_lemma(word["word"], language), word["word"], word.get("translation"),
+                 word.get("definition"), word.get("example_sentence"))
+            )
+            conn.execute(
+                "INSERT INTO vocabulary_fts (rowid, word, translation, definition) VALUES (?, ?, ?, ?)",
+                (cur.lastrowid, word["word"], word.get("translation"), word.get("definition"))
+            )
+
+        for structure in lesson_plan.get("sentence_structures", []):
+            cur = conn.execute(
+                "INSERT INTO structures (lesson_id, language, lemma, structure_name, explanation,"
+                " example_from_text, practice_template) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (lesson_id, language, normalize_lemma(structure["structure_name"], language), structure["structure_name"],
+                 structure.get("explanation"), structure.get("example_from_text"),
+                 structure.get("practice_template"))
+            )
+            conn.execute(
+                "INSERT INTO structures_fts (rowid, structure_name, explanation) VALUES (?, ?, ?)",
+                (cur.lastrowid, structure["structure_name"], structure.get("explanation"))
+            )
+
+    def get_lesson(self, lesson_id: int) -> Optional[dict]:
+        """
+        Fetch a stored lesson by ID.
+
+        Args:
+            lesson_id: ID returned by save_lesson
+
+        Returns:
+            Dictionary with lesson_id, transcript and lesson_plan, or None
+        """
+        with self._lock:
+            row = self._get_conn().execute("SELECT * FROM lessons WHERE id = ?", (lesson_id,)).fetchone()
+        return self._lesson_from_row(row) if row else None
+
+    def get_lesson_json(self, lesson_id: int) -> Optional[bytes]:
+        """
+        Fetch a stored lesson as a ready-to-send JSON body.
+
+        The stored lesson plan is spliced in without being decoded.
+
+        Args:
+            lesson_id: ID returned by save_lesson
+
+        Returns:
+            Encoded lesson (same shape as get_lesson), or None
+        """
+        with self._lock:
+            row = self._get_conn().execute(
+                "SELECT id, transcript, lesson_plan FROM lessons WHERE id = ?", (lesson_id,)
+            ).fetchone()
+        return lesson_json(row["id"], row["transcript"], row["lesson_plan"]) if row else None
+
+    def find_by_video_hash(self, video_sha256: str) -> Optional[dict]:
+        """
+        Fetch the most recent lesson generated from a video with this content hash.
+
+        Args:
+            video_sha256: Hex SHA-256 digest of the video file
+
+        Returns:
+            Dictionary with lesson_id, transcript and lesson_plan, or None
+        """
+        row = self._find_by_video_column("video_sha256", video_sha256)
+        return self._lesson_from_row(row) if row else None
+
+    def find_by_sampled_hash(self, video_sampled_hash: str) -> Optional[dict]:
+        """
+        Fetch the most recent lesson generated from a video with this sampled hash.
+
+        Args:
+            video_sampled_hash: Sampled hash of the video file (see content_hash.hash_file_sampled)
+
+        Returns:
+            Dictionary with lesson_id, transcript and lesson_plan, or None
+        """
+        row = self._find_by_video_column("video_sampled_hash", video_sampled_hash)
+        return self._lesson_from_row(row) if row else None
+
+    def find_json_by_video_hash(self, video_sha256: Optional[str] = None,
+                                video_sampled_hash: Optional[str] = None) -> Optional[bytes]:
+        """
+        Fetch the most recent lesson for a video as a ready-to-send JSON body.
+
+        Args:
+            video_sha256: Hex SHA-256 digest of the video file
+            video_sampled_hash: Sampled hash of the video file, tried if the full hash misses
+
+        Returns:
+            Encoded lesson (same shape as get_lesson), or None
+        """
+        row = None
+        if video_sha256:
+            row = self._find_by_video_column("video_sha256", video_sha256)
+        if not row and video_sampled_hash:
+            row = self._find_by_video_column("video_sampled_hash", video_sampled_hash)
+        return lesson_json(row["id"], row["transcript"], row["lesson_plan"]) if row else None
+
+    def _find_by_video_column(self, column: str, value: str) -> Optional[sqlite3.Row]:
+        """Row of the most recent lesson whose own or linked video has this hash"""
+        with self._lock:
+            return self._get_conn().execute(
+                f"SELECT * FROM lessons WHERE id = ("
+                f" SELECT MAX(id) FROM (SELECT id FROM lessons WHERE {column} = :value"
+                f" UNION ALL SELECT lesson_id FROM lesson_videos WHERE {column} = :value))",
+                {"value": value}
+            ).fetchone()
+
+    def link_video(self, lesson_id: int, video_sha256: str, video_sampled_hash: Optional[str] = None):
+        """
+        Record that another video produced an already stored lesson, without duplicating it.
+
+        Later uploads of that video are then found by find_by_video_hash,
+        find_by_sampled_hash and find_json_by_video_hash.
+
+        Args:
+            lesson_id: ID of the stored lesson
+            video_sha256: Content hash of the other video
+            video_sampled_hash: Sampled hash of the other video, if known
+        """
+        with self._lock:
+            conn = self._get_conn()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO lesson_videos (video_sha256, video_sampled_hash, lesson_id) VALUES (?, ?, ?)",
+                    (video_sha256, video_sampled_hash, lesson_id)
+                )
+
+    def find_by_transcript(self, transcript: str) -> Optional[dict]:
+        """
+        Fetch the most recent lesson generated from an identical transcript.
+
+        Args:
+            transcript: The transcribed text
+
+        Returns:
+            Dictionary with lesson_id, transcript and lesson_plan, or None
+        """
+        transcript_sha256 = hash_bytes(transcript.encode("utf-8"))
+        with self._lock:
+            row = self._get_conn().execute(
+                "SELECT * FROM lessons WHERE transcript_sha256 = ? ORDER BY id DESC LIMIT 1", (transcript_sha256,)
+            ).fetchone()
+        return self._lesson_from_row(row) if row else None
+
+    def list_lessons(self, limit: int = 20, offset: int = 0, language: Optional[str] = None) -> List[dict]:
+        """
+        List stored lessons, newest first.
+
+        Args:
+            limit: Maximum number of lessons to return
+            offset: Number of lessons to skip
+            language: Only include lessons in this language (name or code, e.g. "Spanish" or "es")
+
+        Returns:
+            List of lesson summaries
+        """
+        sql = "SELECT id, detected_language, proficiency_level, summary, created_at FROM lessons"
+        params = []
+        if language:
+            sql += " WHERE language_key = ?"
+            params.append(language_key(language))
+        sql += " ORDER BY id DESC LIMIT ? OFFSET ?"
+        params += [limit, offset]
+
+        with self._lock:
+            rows = self._get_conn().execute(sql, params).fetchall()
+        return [self._summary_from_row(row) for row in rows]
+
+    @staticmethod
+    def _summary_from_row(row: sqlite3.Row) -> dict:
+        return {
+            "lesson_id": row["id"],
+            "detected_language": row["detected_language"],
+            "proficiency_level": row["proficiency_level"],
+            "summary": row["summary"],
+            "created_at": row["created_at"]
+        }
+
+    def search_lessons(self, query: str, limit: int = 20) -> List[dict]:
+        """
+        Full-text search over lesson summaries, transcripts, vocabulary and structures.
+
+        Args:
+            query: Free text search terms
+            limit: Maximum number of lessons to return
+
+        Returns:
+            List of lesson summaries, newest first
+        """
+        match = _fts_query(query)
+        if not match:
+            return []
+
+        # Newest matches first. Ordering by rowid lets FTS5 stop after `limit`
+        # hits instead of scoring every match, which keeps broad queries in the
+        # low milliseconds on large stores.
+        sql = """
+            WITH lesson_hits AS (
+                SELECT rowid AS lesson_id FROM lessons_fts
+                WHERE lessons_fts MATCH :q ORDER BY rowid DESC LIMIT :limit
+            ), vocabulary_hits AS (
+                SELECT rowid AS item_id FROM vocabulary_fts
+                WHERE vocabulary_fts MATCH :q ORDER BY rowid DESC LIMIT :item_limit
+            ), structure_hits AS (
+                SELECT rowid AS item_id FROM structures_fts
+                WHERE structures_fts MATCH :q ORDER BY rowid DESC LIMIT :item_limit
+            ), hits AS (
+                SELECT lesson_id FROM lesson_hits
+                UNION
+                SELECT v.lesson_id FROM vocabulary_hits h JOIN vocabulary v ON v.id = h.item_id
+                UNION
+                SELECT s.lesson_id FROM structure_hits h JOIN structures s ON s.id = h.item_id
+            )
+            SELECT l.id, l.detected_language, l.proficiency_level, l.summary, l.created_at
+            FROM hits JOIN lessons l ON l.id = hits.lesson_id
+            ORDER BY l.id DESC LIMIT :limit
+        """
+        # A lesson can contribute several vocabulary rows, hence the larger item limit
+        params = {"q": match, "limit": limit, "item_limit": limit * 10}
+        with self._lock:
+            rows = self._get_conn().execute(sql, params).fetchall()
+        return [self._summary_from_row(row) for row in rows]
+
+    def search_vocabulary(self, query: str, language: Optional[str] = None, limit: int = 20) -> List[dict]:
+        """
+        Find previously generated vocabulary words.
+
+        Exact lemma matches come first, followed by full-text matches on the
+        word, translation and definition; newest entries first within each.
+
+        Args:
+            query: Word or free text to search for
+            language: Only include words from lessons in this language (name or code)
+            limit: Maximum number of entries to return
+
+        Returns:
+            List of VocabularyWord dictionaries with their lesson_id and language (see language_key)
+        """
+        lemma = normalize_lemma(query, language)
+        match = _fts_query(query)
+        if not lemma and not match:
+            return []
+
+        language_filter = " AND v.language = :language" if language else ""
+        sql = f"""
+            SELECT * FROM (
+                SELECT v.*, 0 AS rank_group FROM vocabulary v
+                WHERE v.lemma = :lemma{language_filter}
+                ORDER BY v.id DESC LIMIT :limit
+            )
+            UNION ALL
+            SELECT * FROM (
+                SELECT v.*, 1 FROM vocabulary_fts
+                JOIN vocabulary v ON v.id = vocabulary_fts.rowid
+                WHERE vocabulary_fts MATCH :q AND v.lemma != :lemma{language_filter}
+                ORDER BY vocabulary_fts.rowid DESC LIMIT :limit
+            )
+            ORDER BY rank_group, id DESC
+            LIMIT :limit
+        """
+        params = {"lemma": lemma, "q": match or '""', "language": language_key(language), "limit": limit}
+        with self._lock:
+            rows = self._get_conn().execute(sql, params).fetchall()
+
+        return [
+            {
+                "lesson_id": row["lesson_id"],
+                "language": row["language"],
+                "word": row["word"],
+                "translation": row["translation"],
+                "definition": row["definition"],
+                "example_sentence": row["example_sentence"]
+            }
+            for row in rows
+        ]
+
+    def get_detail(self, item_type: str, word: str, translation: Optional[str] = None,
+                   language: Optional[str] = None) -> Optional[dict]:
+        """
+        Fetch a previously generated detail panel, shared across lessons by lemma.
+
+        Args:
+            item_type: Either 'vocab' or 'grammar'
+            word: The vocabulary word (for vocab) or structure name (for grammar)
+            translation: Translation of the word (for vocab only)
+            language: Language of the lesson the item comes from
+
+        Returns:
+            Dictionary with description and examples, or None
+        """
+        with self._lock:
+            row = self._get_conn().execute(
+                "SELECT result FROM details WHERE item_type = ? AND lemma = ? AND qualifier = ? AND language = ?",
+                detail_key(item_type, word, translation, language)
+            ).fetchone()
+        return loads(row["result"]) if row else None
+
+    def save_detail(self, item_type: str, word: str, result: dict, translation: Optional[str] = None,
+                    language: Optional[str] = None):
+        """
+        Store a generated detail panel for reuse.
+
+        Args:
+            item_type: Either 'vocab' or 'grammar'
+            word: The vocabulary word (for vocab) or structure name (for grammar)
+            result: Dictionary with description and examples
+            translation: Translation of the word (for vocab only)
+            language: Language of the lesson the item comes from
+        """
+        with self._lock:
+            conn = self._get_conn()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO details (item_type, lemma, qualifier, language, result, created_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (*detail_key(item_type, word, translation, language), dumps(result).decode("utf-8"), time.time())
+                )
+
+
+# Global instance
+lesson_store = LessonStore()
@@ -0,0 +1,199 @@
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+from services.lesson_store import detail_key
+from services.serialization import dumps
+
+# Where the build step writes pre-generated lessons for the bundled sample videos
+DEFAULT_LIBRARY_DIR = Path(__file__).parent.parent / "sample_library"
+MANIFEST_NAME = "manifest.json"
+
+# The bundled sample videos shipped with the frontend
+DEFAULT_VIDEOS_DIR = Path(__file__).parent.parent.parent / "client-safe" / "public" / "videos"
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+
+
+class SampleLibrary:
+    """
+    Read-only access to lessons pre-generated by build_sample_library.py.
+
+    The manifest maps each sample video to its artifact file together with the
+    video's content hash and the prompt fingerprint it was generated with.
+    Entries whose fingerprint no longer matches the current prompts are ignored
+    so stale lessons are never served.
+    """
+
+    def __init__(self, library_dir: Optional[str] = None):
+        self.library_dir = Path(library_dir or os.getenv("SAMPLE_LIBRARY_DIR", DEFAULT_LIBRARY_DIR))
+        self._artifacts = None
+        self._encoded = None
+        self._lesson_encoded = None
+        self._by_hash = None
+        self._by_sampled_hash = None
+        self._details = None
+
+    def load(self):
+        """Lazy load the manifest and every fresh artifact it lists"""
+        if self._artifacts is not None:
+            return
+
+        self._artifacts = {}
+        self._encoded = {}
+        self._lesson_encoded = {}
+        self._by_hash = {}
+        self._by_sampled_hash = {}
+        self._details = {}
+
+        manifest_path = self.library_dir / MANIFEST_NAME
+        if not manifest_path.exists():
+            return
+
+        # Imported here so the library can be inspected without loading the agent
+        from services.agent_service import agent_service
+
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        fingerprint = agent_service.prompt_fingerprint()
+        for name, entry in manifest.get("samples", {}).items():
+            if entry.get("prompt_fingerprint") != fingerprint:
+                print(f"Sample library: skipping stale entry for {name}")
+                continue
+
+            artifact_path = self.library_dir / entry["artifact"]
+            if not artifact_path.exists():
+                continue
+
+            with open(artifact_path, "r", encoding="utf-8") as f:
+                artifact = json.load(f)
+
+            self._artifacts[name] = artifact
+            # Samples are served often and never change: encode the response body once
+            self._encoded[name] = dumps({
+                "transcript": artifact["transcript"],
+                "lesson_plan": artifact["lesson_plan"],
+                "details": artifact.get("details", {})
+            })
+            # Body returned when an upload or hash check matches the sample
+            self._lesson_encoded[name] = dumps({
+                "transcript": artifact["transcript"],
+                "lesson_plan": artifact["lesson_plan"]
+            })
+            self._by_hash[entry["video_sha256"]] = name
+            if entry.get("video_sampled_hash"):
+                self._by_sampled_hash[entry["video_sampled_hash"]] = name
+            self._index_details(artifact)
+
+    def _index_details(self, artifact: dict):
+        """Key an artifact's detail panels the same way LessonStore does"""
+        details = artifact.get("details", {})
+        lesson_plan = artifact["lesson_plan"]
+        language = lesson_plan.get("detected_language")
+        for word in lesson_plan.get("vocabulary_words", []):
+            detail = details.get("vocab", {}).get(word["word"])
+            if detail:
+                self._details.setdefault(detail_key("vocab", word["word"], word["translation"], language), detail)
+        for structure in lesson_plan.get("sentence_structures", []):
+            detail = details.get("grammar", {}).get(structure["structure_name"])
+            if detail:
+                self._details.setdefault(detail_key("grammar", structure["structure_name"], language=language), detail)
+
+    def reload(self):
+        """Drop loaded artifacts so the next lookup re-reads the manifest"""
+        self._artifacts = None
+        self._encoded = None
+        self._lesson_encoded = None
+        self._by_hash = None
+        self._by_sampled_hash = None
+        self._details = None
+
+    def get_sample(self, name: str) -> Optional[dict]:
+        """
+        Look up a pre-generated lesson by sample video file name.
+
+        Args:
+            name: File name of the bundled video, e.g. "english-sample.mp4"
+
+        Returns:
+            Artifact with transcript, lesson_plan and details, or None
+        """
+        self.load()
+        return self._artifacts.get(name)
+
+    def get_sample_json(self, name: str) -> Optional[bytes]:
+        """
+        Look up the pre-encoded response body for a sample video.
+
+        Args:
+            name: File name of the bundled video, e.g. "english-sample.mp4"
+
+        Returns:
+            Encoded {"transcript", "lesson_plan", "details"} object, or None
+        """
+        self.load()
+        return self._encoded.get(name)
+
+    def find_by_hash(self, video_sha256: str) -> Optional[dict]:
+        """
+        Look up a pre-generated lesson by the content hash of an uploaded video.
+
+        Args:
+            video_sha256: Hex SHA-256 digest of the video file
+
+        Returns:
+            Artifact with transcript, lesson_plan and details, or None
+        """
+        self.load()
+        return self._artifacts.get(self._by_hash.get(video_sha256))
+
+    def find_by_sampled_hash(self, video_sampled_hash: str) -> Optional[dict]:
+        """
+        Look up a pre-generated lesson by the sampled hash of a video.
+
+        Args:
+            video_sampled_hash: Sampled hash of the video file (see content_hash.hash_file_sampled)
+
+        Returns:
+            Artifact with transcript, lesson_plan and details, or None
+        """
+        self.load()
+        return self._artifacts.get(self._by_sampled_hash.get(video_sampled_hash))
+
+    def find_json_by_hash(self, video_sha256: Optional[str] = None,
+                          video_sampled_hash: Optional[str] = None) -> Optional[bytes]:
+        """
+        Look up the pre-encoded lesson for an uploaded video by full or sampled hash.
+
+        Args:
+            video_sha256: Hex SHA-256 digest of the video file
+            video_sampled_hash: Sampled hash of the video file, tried if the full hash misses
+
+        Returns:
+            Encoded {"transcript", "lesson_plan"} object, or None
+        """
+        self.load()
+        name = self._by_hash.get(video_sha256) or self._by_sampled_hash.get(video_sampled_hash)
+        return self._lesson_encoded.get(name)
+
+    def get_detail(self, item_type: str, key: str, translation: Optional[str] = None,
+                   language: Optional[str] = None) -> Optional[dict]:
+        """
+        Look up a pre-generated detail panel for a vocabulary word or grammar structure.
+
+        Args:
+            item_type: Either 'vocab' or 'grammar'
+            key: The vocabulary word or structure name
+            translation: Translation of the word (for vocab only); must match the sample's
+            language: Language of the lesson the item comes from; must match the sample's
+
+        Returns:
+            Dictionary with description and examples, or None
+        """
+        self.load()
+        return self._details.get(detail_key(item_type, key, translation, language))
+
+
+# Global instance
+sample_library = SampleLibrary()
@@ -0,0 +1,88 @@
+from typing import Any, Union
+
+import orjson
+from fastapi.responses import Response
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a value as compact UTF-8 JSON.
+
+    Args:
+        value: JSON-serializable value (dicts, lists, strings, numbers)
+
+    Returns:
+        Encoded JSON bytes
+    """
+    return orjson.dumps(value)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    Decode JSON produced by dumps (or any other encoder).
+
+    Args:
+        data: JSON bytes or text
+
+    Returns:
+        Decoded value
+    """
+    return orjson.loads(data)
+
+
+def lesson_json(lesson_id: int, transcript: str, lesson_plan_json: Union[bytes, str]) -> bytes:
+    """
+    Build a lesson response body around an already-encoded lesson plan.
+
+    The stored plan is spliced in verbatim, so serving a stored lesson never
+    decodes and re-encodes its (large) plan.
+
+    Args:
+        lesson_id: ID of the stored lesson
+        transcript: The transcribed text
+        lesson_plan_json: Encoded lesson plan as stored
+
+    Returns:
+        Encoded {"lesson_id", "transcript", "lesson_plan"} object
+    """
+    if isinstance(lesson_plan_json, str):
+        lesson_plan_json = lesson_plan_json.encode("utf-8")
+    return b"".join((
+        b'{"lesson_id":', str(int(lesson_id)).encode("ascii"),
+        b',"transcript":', orjson.dumps(transcript),
+        b',"lesson_plan":', lesson_plan_json, b"}"
+    ))
+
+
+def extend_json(encoded: bytes, fields: dict) -> bytes:
+    """
+    Add fields in front of an already-encoded JSON object without decoding it.
+
+    Args:
+        encoded: Encoded JSON object, e.g. from lesson_json
+        fields: Extra keys and values, e.g. {"status": "hit"}
+
+    Returns:
+        Encoded object with the extra fields followed by the original ones
+    """
+    prefix = orjson.dumps(fields)
+    if encoded.strip() == b"{}":
+        return prefix
+    return prefix[:-1] + b"," + encoded.lstrip()[1:]
+
+
+class JSONBytesResponse(Response):
+    """
+    JSON response encoded with orjson, or sent as-is when given bytes.
+
+    Returning this from a route skips FastAPI's jsonable_encoder pass, so
+    payloads built from plain dicts are encoded exactly once and cached,
+    pre-encoded payloads are not encoded at all.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            return bytes(content)
+        return orjson.dumps(content)
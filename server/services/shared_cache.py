@@ -0,0 +1,275 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from services.serialization import dumps, loads
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / "data" / "shared_cache.db"
+DEFAULT_TTL_SECONDS = int(os.getenv("SHARED_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+LEASE_SECONDS = float(os.getenv("SINGLE_FLIGHT_LEASE_SECONDS", "600"))
+POLL_INTERVAL_SECONDS = 0.25
+# Expired rows are deleted on connect and after every SWEEP_EVERY_SETS writes
+SWEEP_EVERY_SETS = int(os.getenv("SHARED_CACHE_SWEEP_EVERY", "100"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS inflight (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    lease_until REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS interest (
+    key TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (key, owner)
+);
+"""
+
+
+class SharedCache:
+    """
+    Cache and single-flight backend shared by every worker process.
+
+    Values live in a SQLite database in WAL mode, so all uvicorn workers on the
+    host see the same entries. get_or_compute coalesces concurrent requests for
+    the same key: within a process waiters share one asyncio task, and across
+    processes the first worker to claim a lease row computes while the others
+    poll for the result. A crashed owner's lease expires and another worker
+    takes over.
+
+    When every waiter for a computation has been cancelled (e.g. the clients
+    disconnected) the computation is cancelled too, unless a worker in another
+    process is still polling for it. Both outcomes are counted in stats.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = str(db_path or os.getenv("SHARED_CACHE_PATH", DEFAULT_CACHE_PATH))
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._conn = None
+        self._conn_pid = None
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._waiters = {}
+        self._sets_since_sweep = 0
+        self.stats = {"cancelled": 0, "kept_for_waiters": 0}
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Lazy open the database; reopen after a fork so workers never share a handle"""
+        if self._conn is None or self._conn_pid != os.getpid():
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+            self._conn_pid = os.getpid()
+            self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        return self._conn
+
+    def get_raw(self, key: str) -> Optional[bytes]:
+        """
+        Fetch a cached value as the JSON bytes it was stored as.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Encoded JSON, or None on a miss or expired entry
+        """
+        with self._lock:
+            row = self._get_conn().execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Fetch a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached JSON value, or None on a miss or expired entry
+        """
+        raw = self.get_raw(key)
+        return loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        """
+        Store a JSON-serializable value.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time to live in seconds (defaults to SHARED_CACHE_TTL_SECONDS)
+        """
+        expires_at = time.time() + (ttl if ttl is not None else DEFAULT_TTL_SECONDS)
+        payload = dumps(value)
+        with self._lock:
+            conn = self._get_conn()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, payload, expires_at)
+                )
+            self._sets_since_sweep += 1
+            if self._sets_since_sweep >= SWEEP_EVERY_SETS:
+                self._sweep(conn)
+
+    def _sweep(self, conn: sqlite3.Connection):
+        """Delete expired entries and stale interest heartbeats (caller holds the lock)"""
+        now = time.time()
+        with conn:
+            conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+            conn.execute("DELETE FROM interest WHERE expires_at <= ?", (now,))
+        self._sets_since_sweep = 0
+
+    def _try_claim(self, key: str) -> bool:
+        """Claim the cross-process lease for a key, taking over expired leases"""
+        now = time.time()
+        with self._lock:
+            conn = self._get_conn()
+            with conn:
+                conn.execute("DELETE FROM inflight WHERE key = ? AND lease_until <= ?", (key, now))
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO inflight (key, owner, lease_until) VALUES (?, ?, ?)",
+                    (key, self.owner, now + LEASE_SECONDS)
+                )
+        return cur.rowcount == 1
+
+    def _release(self, key: str):
+        with self._lock:
+            conn = self._get_conn()
+            with conn:
+                conn.execute("DELETE FROM inflight WHERE key = ? AND owner = ?", (key, self.owner))
+
+    def _register_interest(self, key: str):
+        """Heartbeat telling the lease owner that this process still wants the value"""
+        with self._lock:
+            conn = self._get_conn()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO interest (key, owner, expires_at) VALUES (?, ?, ?)",
+                    (key, self.owner, time.time() + 4 * POLL_INTERVAL_SECONDS)
+                )
+
+    def _drop_interest(self, key: str):
+        with self._lock:
+            conn = self._get_conn()
+            with conn:
+                conn.execute("DELETE FROM interest WHERE key = ? AND owner = ?", (key, self.owner))
+
+    def _has_remote_interest(self, key: str) -> bool:
+        """Whether another process is polling for this key"""
+        with self._lock:
+            row = self._get_conn().execute(
+                "SELECT 1 FROM interest WHERE key = ? AND owner != ? AND expires_at > ? LIMIT 1",
+                (key, self.owner, time.time())
+            ).fetchone()
+        return row is not None
+
+    async def _compute_once(self, key: str, compute: Callable[[], Awaitable[Any]], ttl: Optional[int]) -> Any:
+        """Run compute in exactly one worker process, waiting on whoever holds the lease"""
+        try:
+            while True:
+                cached = self.get(key)
+                if cached is not None:
+                    return cached
+
+                if self._try_claim(key):
+                    try:
+                        value = await compute()
+                        self.set(key, value, ttl)
+                        return value
+                    finally:
+                        self._release(key)
+
+                self._register_interest(key)
+                await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        finally:
+            self._drop_interest(key)
+
+    def _forget_flight(self, key: str, flight: asyncio.Future):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            flight.exception()  # retrieved here so abandoned failures aren't logged as unhandled
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]],
+                             ttl: Optional[int] = None, release: Optional[Callable[[], None]] = None) -> Any:
+        """
+        Return the cached value for key, computing it at most once across all workers.
+
+        Args:
+            key: Cache key
+            compute: Coroutine factory producing a JSON-serializable value
+            ttl: Time to live in seconds for the computed value
+            release: Called exactly once when compute's inputs are no longer needed:
+                when the computation this call started has finished (even if the
+                caller was cancelled earlier), or straight away if this call didn't
+                start one. Lets inputs such as temp files outlive the request.
+
+        Returns:
+            The cached or freshly computed value
+        """
+        started = False
+        try:
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = asyncio.ensure_future(self._compute_once(key, compute, ttl))
+                self._flights[key] = flight
+                flight.add_done_callback(lambda done: self._forget_flight(key, done))
+                if release is not None:
+                    flight.add_done_callback(lambda done: release())
+                started = True
+        finally:
+            if release is not None and not started:
+                release()
+
+        self._waiters[flight] = self._waiters.get(flight, 0) + 1
+        try:
+            return await asyncio.shield(flight)
+        finally:
+            self._waiters[flight] -= 1
+            if self._waiters[flight] == 0:
+                del self._waiters[flight]
+                if not flight.done():
+                    # The last local waiter went away (cancelled) while work is still running
+                    if self._has_remote_interest(key):
+                        self.stats["kept_for_waiters"] += 1
+                    else:
+                        flight.cancel()
+                        self.stats["cancelled"] += 1
+
+    def connect(self):
+        """Open the database ahead of the first request and drop expired rows"""
+        with self._lock:
+            self._sweep(self._get_conn())
+
+    def close(self):
+        """Close the database handle"""
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+            self._conn_pid = None
+
+
+# Global instance
+shared_cache = SharedCache()
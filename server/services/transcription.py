@@ -0,0 +1,266 @@
+import asyncio
+import contextlib
+import json
+import os
+import threading
+import wave
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+from services.language_id import iso_code
+
+load_dotenv()
+
+# Languages the recognizer considers when neither the request nor language ID narrows them down
+DEFAULT_LANGUAGE_CODES = [
+    code.strip() for code in os.getenv("TRANSCRIPTION_LANGUAGES", "es-ES,en-US,fr-FR").split(",") if code.strip()
+]
+
+# "google", "local" or "auto" (local for clips up to LOCAL_TRANSCRIPTION_MAX_SECONDS)
+TRANSCRIPTION_BACKEND = os.getenv("TRANSCRIPTION_BACKEND", "auto")
+LOCAL_TRANSCRIPTION_MAX_SECONDS = float(os.getenv("LOCAL_TRANSCRIPTION_MAX_SECONDS", "60"))
+
+# Speech-to-Text recognizer model, with per-locale overrides for single-language
+# requests, e.g. TRANSCRIPTION_MODEL_OVERRIDES="ja-JP=short,hi-IN=short"
+GOOGLE_SPEECH_MODEL = os.getenv("TRANSCRIPTION_MODEL", "long")
+GOOGLE_SPEECH_MODEL_OVERRIDES = {
+    locale.strip(): model.strip()
+    for locale, _, model in (
+        item.partition("=") for item in os.getenv("TRANSCRIPTION_MODEL_OVERRIDES", "").split(",") if "=" in item
+    )
+}
+
+
+class TranscriptionBackend(ABC):
+    """Speech-to-text engine used by the video pipeline"""
+
+    name: str = ""
+
+    def is_available(self) -> bool:
+        """Whether the backend's dependencies and credentials are present"""
+        return True
+
+    @abstractmethod
+    async def transcribe(self, audio_path: str, language_codes: List[str]) -> str:
+        """
+        Transcribe an audio file.
+
+        Args:
+            audio_path: Path to a WAV file
+            language_codes: BCP-47 codes of the languages the audio may be in
+
+        Returns:
+            Transcribed text
+        """
+
+
+class GoogleSpeechBackend(TranscriptionBackend):
+    """Google Cloud Speech-to-Text v2"""
+
+    name = "google"
+
+    def __init__(self):
+        self.client = None
+        self._client_loop = None
+
+    def _get_client(self):
+        """Lazy load the async Speech client (bound to the running event loop)"""
+        loop = asyncio.get_running_loop()
+        if self.client is None or self._client_loop is not loop:
+            from google.cloud.speech_v2 import SpeechAsyncClient
+            self.client = SpeechAsyncClient()
+            self._client_loop = loop
+        return self.client
+
+    @staticmethod
+    def model_for(language_codes: List[str]) -> str:
+        """
+        Recognizer model for a request.
+
+        Args:
+            language_codes: BCP-47 codes the audio may be in
+
+        Returns:
+            The locale's override when exactly one language is known, else TRANSCRIPTION_MODEL
+        """
+        if len(language_codes) == 1:
+            return GOOGLE_SPEECH_MODEL_OVERRIDES.get(language_codes[0], GOOGLE_SPEECH_MODEL)
+        return GOOGLE_SPEECH_MODEL
+
+    def is_available(self) -> bool:
+        credentials_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
+        return bool(credentials_path) and os.path.exists(credentials_path)
+
+    async def transcribe(self, audio_path: str, language_codes: List[str]) -> str:
+        from google.cloud.speech_v2.types import cloud_speech
+
+        # Verify credentials are set
+        credentials_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
+        if not credentials_path:
+            raise ValueError("GOOGLE_APPLICATION_CREDENTIALS environment variable not set")
+
+        if not os.path.exists(credentials_path):
+            raise ValueError(f"Credentials file not found at: {credentials_path}")
+
+        print(f"Using credentials from: {credentials_path}")
+
+        # Initialize the Speech-to-Text v2 client
+        client = self._get_client()
+
+        # Read the audio file
+        with open(audio_path, "rb") as audio_file:
+            content = audio_file.read()
+
+        # Configure recognition settings for v2 API
+        config = cloud_speech.RecognitionConfig(
+            auto_decoding_config=cloud_speech.AutoDetectDecodingConfig(),
+            language_codes=language_codes,
+            model=self.model_for(language_codes),
+            features=cloud_speech.RecognitionFeatures(
+                enable_automatic_punctuation=True,
+            ),
+        )
+
+        # Build the request - use project ID from credentials
+        # First try environment variable, then extract from credentials file
+        project_id = os.getenv('GOOGLE_CLOUD_PROJECT')
+
+        if not project_id:
+            # Extract project_id from credentials file
+            with open(credentials_path, 'r') as f:
+                creds_data = json.load(f)
+                project_id = creds_data.get('project_id', 'gen-lang-client-0982694589')
+
+        print(f"Using project ID: {project_id}")
+
+        request = cloud_speech.RecognizeRequest(
+            recognizer=f"projects/{project_id}/locations/global/recognizers/_",
+            config=config,
+            content=content,
+        )
+
+        print("Starting transcription with Speech-to-Text v2...")
+
+        # Perform the transcription; cancelling the awaiting task aborts the RPC
+        response = await client.recognize(request=request)
+
+        print("Transcription completed.")
+
+        # Combine all transcription results
+        transcript = ""
+        for result in response.results:
+            transcript += result.alternatives[0].transcript + " "
+
+        return transcript.strip()
+
+
+class LocalWhisperBackend(TranscriptionBackend):
+    """
+    Offline CPU transcription with faster-whisper (optional dependency).
+
+    The model is downloaded once and then runs fully offline. Size and
+    quantization are configurable through LOCAL_WHISPER_MODEL (default "base")
+    and LOCAL_WHISPER_COMPUTE_TYPE (default "int8").
+    """
+
+    name = "local"
+
+    def __init__(self):
+        self.model = None
+        self.model_size = os.getenv("LOCAL_WHISPER_MODEL", "base")
+        self.compute_type = os.getenv("LOCAL_WHISPER_COMPUTE_TYPE", "int8")
+        self.cpu_threads = int(os.getenv("LOCAL_WHISPER_THREADS", "0"))
+
+    def is_available(self) -> bool:
+        try:
+            import faster_whisper  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def _get_model(self):
+        """Lazy load the Whisper model"""
+        if self.model is None:
+            from faster_whisper import WhisperModel
+            self.model = WhisperModel(
+                self.model_size,
+                device="cpu",
+                compute_type=self.compute_type,
+                cpu_threads=self.cpu_threads
+            )
+        return self.model
+
+    def _transcribe_sync(self, audio_path: str, language_codes: List[str], cancelled: threading.Event) -> str:
+        # Whisper takes a single ISO 639-1 code ("zh", not "cmn"); with several candidates let it detect
+        language = iso_code(language_codes[0]) if len(language_codes) == 1 else None
+        segments, info = self._get_model().transcribe(audio_path, language=language, beam_size=1, vad_filter=True)
+
+        # Segments are decoded lazily, so checking between them stops the work promptly
+        texts = []
+        for segment in segments:
+            if cancelled.is_set():
+                print("Local transcription cancelled.")
+                return ""
+            texts.append(segment.text.strip())
+
+        print(f"Local transcription completed (language: {info.language}).")
+        return " ".join(texts).strip()
+
+    async def transcribe(self, audio_path: str, language_codes: List[str]) -> str:
+        if not self.is_available():
+            raise ValueError("Local transcription requires the faster-whisper package")
+        # CPU-bound: keep it off the event loop, and tell the thread to stop if we're cancelled
+        cancelled = threading.Event()
+        try:
+            return await asyncio.to_thread(self._transcribe_sync, audio_path, language_codes, cancelled)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+
+BACKENDS = {
+    GoogleSpeechBackend.name: GoogleSpeechBackend(),
+    LocalWhisperBackend.name: LocalWhisperBackend(),
+}
+
+
+def get_audio_duration(audio_path: str) -> float:
+    """
+    Duration of a WAV file in seconds.
+
+    Args:
+        audio_path: Path to a WAV file
+
+    Returns:
+        Duration in seconds
+    """
+    with contextlib.closing(wave.open(audio_path, "rb")) as wav:
+        return wav.getnframes() / float(wav.getframerate())
+
+
+def select_backend(requested: Optional[str] = None, duration_seconds: Optional[float] = None) -> TranscriptionBackend:
+    """
+    Pick a transcription backend for a request.
+
+    An explicitly requested backend wins. Otherwise TRANSCRIPTION_BACKEND
+    decides; in "auto" mode clips up to LOCAL_TRANSCRIPTION_MAX_SECONDS go to
+    the local engine when it is installed, everything else to Google.
+
+    Args:
+        requested: Backend name chosen by the caller, if any
+        duration_seconds: Length of the audio
+
+    Returns:
+        The backend to use
+    """
+    name = requested or TRANSCRIPTION_BACKEND
+    if name == "auto":
+        local = BACKENDS[LocalWhisperBackend.name]
+        is_short = duration_seconds is not None and duration_seconds <= LOCAL_TRANSCRIPTION_MAX_SECONDS
+        name = local.name if is_short and local.is_available() else GoogleSpeechBackend.name
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown transcription backend: {name}")
+    return BACKENDS[name]
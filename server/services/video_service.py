@@ -1,13 +1,61 @@
+import asyncio
 import os
 import tempfile
-from pathlib import Path
-from google.cloud.speech_v2 import SpeechClient
-from google.cloud.speech_v2.types import cloud_speech
-from moviepy import VideoFileClip
+import time
+from typing import List, Optional, Tuple
+from moviepy.config import FFMPEG_BINARY
 from dotenv import load_dotenv
+from services.language_id import LANGUAGE_ID_SAMPLE_SECONDS, language_identifier
+from services.transcription import DEFAULT_LANGUAGE_CODES, get_audio_duration, select_backend
 
 load_dotenv()
 
+
+async def _run_ffmpeg(video_path: str, *outputs: List[str]):
+    """
+    Run moviepy's ffmpeg binary as a subprocess writing one or more outputs.
+
+    The event loop stays free while it runs, and a cancelled request kills the
+    extraction immediately and removes every partially written output.
+
+    Args:
+        video_path: Path to the video file
+        outputs: Output options, each ending with the output file path
+    """
+    command = [FFMPEG_BINARY, "-y", "-loglevel", "error", "-i", video_path]
+    for output in outputs:
+        command += output
+
+    process = None
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        _, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError(f"Audio extraction failed: {stderr.decode(errors='replace').strip()}")
+    except BaseException:
+        if process is not None and process.returncode is None:
+            process.kill()
+            await process.wait()
+        for output in outputs:
+            if os.path.exists(output[-1]):
+                os.remove(output[-1])
+        raise
+
+
+def _temp_wav() -> str:
+    fd, path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    return path
+
+
+# Same format moviepy's write_audiofile produced
+FULL_AUDIO_OPTIONS = ["-vn", "-acodec", "pcm_s16le", "-ar", "44100", "-ac", "2"]
+
+
 async def extract_audio_from_video(video_path: str) -> str:
     """
     Extract audio from video file and save as WAV format.
@@ -18,89 +66,74 @@ async def extract_audio_from_video(video_path: str) -> str:
     Returns:
         Path to the extracted audio file
     """
-    video = VideoFileClip(video_path)
-
-    # Create temporary file for audio
-    audio_fd, audio_path = tempfile.mkstemp(suffix=".wav")
-    os.close(audio_fd)
-
-    # Extract audio and save as WAV
-    video.audio.write_audiofile(audio_path, codec='pcm_s16le')
-    video.close()
-
+    audio_path = _temp_wav()
+    await _run_ffmpeg(video_path, FULL_AUDIO_OPTIONS + [audio_path])
     return audio_path
 
 
-async def transcribe_audio(audio_path: str) -> str:
+async def extract_audio_with_sample(video_path: str, sample_seconds: float) -> Tuple[str, str]:
     """
-    Transcribe audio file using Google Speech-to-Text v2 API.
+    Extract the full audio and a short 16 kHz mono sample in a single ffmpeg pass.
 
     Args:
-        audio_path: Path to the audio file
+        video_path: Path to the video file
+        sample_seconds: Length of the sample taken from the start of the audio
 
     Returns:
-        Transcribed text
+        Tuple of (full audio path, sample path)
     """
-    try:
-        # Verify credentials are set
-        credentials_path = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
-        if not credentials_path:
-            raise ValueError("GOOGLE_APPLICATION_CREDENTIALS environment variable not set")
-
-        if not os.path.exists(credentials_path):
-            raise ValueError(f"Credentials file not found at: {credentials_path}")
-
-        print(f"Using credentials from: {credentials_path}")
-
-        # Initialize the Speech-to-Text v2 client
-        client = SpeechClient()
-
-        # Read the audio file
-        with open(audio_path, "rb") as audio_file:
-            content = audio_file.read()
-
-        # Configure recognition settings for v2 API with Spanish and English support
-        config = cloud_speech.RecognitionConfig(
-            auto_decoding_config=cloud_speech.AutoDetectDecodingConfig(),
-            language_codes=["es-ES", "en-US"],  # Support both Spanish and English
-            model="long",
-            features=cloud_speech.RecognitionFeatures(
-                enable_automatic_punctuation=True,
-            ),
-        )
+    audio_path = _temp_wav()
+    sample_path = _temp_wav()
+    await _run_ffmpeg(
+        video_path,
+        FULL_AUDIO_OPTIONS + [audio_path],
+        ["-vn", "-t", str(sample_seconds), "-acodec", "pcm_s16le", "-ar", "16000", "-ac", "1", sample_path]
+    )
+    return audio_path, sample_path
 
-        # Build the request - use project ID from credentials
-        # First try environment variable, then extract from credentials file
-        project_id = os.getenv('GOOGLE_CLOUD_PROJECT')
 
-        if not project_id:
-            # Extract project_id from credentials file
-            import json
-            with open(credentials_path, 'r') as f:
-                creds_data = json.load(f)
-                project_id = creds_data.get('project_id', 'gen-lang-client-0982694589')
+async def identify_language(sample_path: str, language_codes: Optional[List[str]] = None) -> Optional[dict]:
+    """
+    Identify the spoken language from an audio sample.
 
-        print(f"Using project ID: {project_id}")
+    Args:
+        sample_path: Path to the sample written by extract_audio_with_sample
+        language_codes: Languages the caller allowed, if any
 
-        request = cloud_speech.RecognizeRequest(
-            recognizer=f"projects/{project_id}/locations/global/recognizers/_",
-            config=config,
-            content=content,
-        )
+    Returns:
+        Language ID result (see LanguageIdentifier.identify), or None
+    """
+    try:
+        start = time.perf_counter()
+        result = await language_identifier.identify(sample_path, language_codes)
+        if result:
+            print(f"Language identified as {result['language_code']} (p={result['probability']}) "
+                  f"in {time.perf_counter() - start:.2f}s")
+        return result
+    except Exception as e:
+        # Identification only narrows the recognizer settings; never fail the upload over it
+        print(f"Language identification failed: {str(e)}")
+        return None
 
-        print("Starting transcription with Speech-to-Text v2...")
 
-        # Perform the transcription
-        response = client.recognize(request=request)
+async def transcribe_audio(audio_path: str, backend: Optional[str] = None,
+                           language_codes: Optional[List[str]] = None) -> str:
+    """
+    Transcribe audio file with the selected transcription backend.
 
-        print("Transcription completed.")
+    Args:
+        audio_path: Path to the audio file
+        backend: Backend name ('google', 'local' or 'auto'); defaults to TRANSCRIPTION_BACKEND
+        language_codes: Languages the audio may be in; defaults to TRANSCRIPTION_LANGUAGES
 
-        # Combine all transcription results
-        transcript = ""
-        for result in response.results:
-            transcript += result.alternatives[0].transcript + " "
+    Returns:
+        Transcribed text
+    """
+    try:
+        engine = select_backend(backend, get_audio_duration(audio_path))
+        print(f"Transcribing with {engine.name} backend")
 
-        return transcript.strip()
+        return await engine.transcribe(audio_path, language_codes or DEFAULT_LANGUAGE_CODES)
 
     except Exception as e:
         print(f"Error during transcription: {str(e)}")
@@ -108,28 +141,46 @@ async def transcribe_audio(audio_path: str) -> str:
         raise Exception(f"Transcription failed: {str(e)}")
 
 
-async def process_video(video_path: str) -> str:
+async def process_video(video_path: str, backend: Optional[str] = None,
+                        language_codes: Optional[List[str]] = None) -> dict:
     """
-    Process video file: extract audio, transcribe, and clean up temporary files.
+    Process video file: extract audio, identify its language, transcribe, and
+    clean up temporary files.
+
+    Unless a single language was requested, a short sample cut out during
+    extraction is run through local language identification first; a confident
+    result narrows the recognizer to that one language.
 
     Args:
         video_path: Path to the video file
+        backend: Transcription backend name; defaults to TRANSCRIPTION_BACKEND
+        language_codes: Languages the audio may be in
 
     Returns:
-        Transcribed text from the video
+        Dictionary with the transcript and the language ID result (or None)
     """
     audio_path = None
+    sample_path = None
     try:
-        # Extract audio from video
-        audio_path = await extract_audio_from_video(video_path)
+        language = None
+        if (not language_codes or len(language_codes) > 1) and language_identifier.is_available():
+            # Extract audio plus a language ID sample from the video
+            audio_path, sample_path = await extract_audio_with_sample(video_path, LANGUAGE_ID_SAMPLE_SECONDS)
+            language = await identify_language(sample_path, language_codes)
+        else:
+            # Extract audio from video
+            audio_path = await extract_audio_from_video(video_path)
 
         print("Audio extracted to:", audio_path)
 
         # Transcribe the audio
-        transcript = await transcribe_audio(audio_path)
+        if language:
+            language_codes = [language["language_code"]]
+        transcript = await transcribe_audio(audio_path, backend, language_codes)
 
-        return transcript
+        return {"transcript": transcript, "language": language}
     finally:
-        # Clean up temporary audio file
-        if audio_path and os.path.exists(audio_path):
-            os.remove(audio_path)
+        # Clean up temporary audio files
+        for path in (audio_path, sample_path):
+            if path and os.path.exists(path):
+                os.remove(path)
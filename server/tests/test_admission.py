@@ -0,0 +1,178 @@
+import asyncio
+
+import pytest
+
+from services.admission import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    AdmissionController,
+    AdmissionGate,
+    Overloaded,
+)
+
+
+def make_controller(max_wait=5.0):
+    return AdmissionController(
+        limits={"video": 1, "detail": 2},
+        queue_limits={"video": 1, "detail": 2},
+        total_slots=2,
+        max_wait=max_wait
+    )
+
+
+def test_queued_requests_are_granted_in_priority_order():
+    controller = make_controller()
+    order = []
+
+    async def request(endpoint, priority, name):
+        async with controller.admit(endpoint, priority):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        # Fill both shared slots, then queue a video job before a detail lookup
+        async with controller.admit("detail"), controller.admit("video"):
+            queued = [asyncio.ensure_future(request("video", PRIORITY_LOW, "video"))]
+            await asyncio.sleep(0)
+            queued.append(asyncio.ensure_future(request("detail", PRIORITY_HIGH, "detail")))
+            await asyncio.sleep(0.01)
+            assert controller.snapshot()["queued"] == {"video": 1, "detail": 1}
+        await asyncio.gather(*queued)
+
+    asyncio.run(main())
+
+    assert order == ["detail", "video"]
+    assert controller.snapshot()["active"] == {"video": 0, "detail": 0}
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    controller = make_controller()
+
+    async def main():
+        async with controller.admit("video"):
+            waiting = asyncio.ensure_future(controller.admit("video").__aenter__())
+            await asyncio.sleep(0)
+            with pytest.raises(Overloaded) as excinfo:
+                async with controller.admit("video"):
+                    pass
+            waiting.cancel()
+            await asyncio.gather(waiting, return_exceptions=True)
+        return excinfo.value
+
+    error = asyncio.run(main())
+
+    assert error.status_code == 503
+    assert int(error.headers["Retry-After"]) >= 1
+
+
+def test_wait_timeout_is_rejected():
+    controller = make_controller(max_wait=0.05)
+
+    async def main():
+        async with controller.admit("video"):
+            with pytest.raises(Overloaded):
+                async with controller.admit("video"):
+                    pass
+
+    asyncio.run(main())
+
+    assert controller.snapshot()["queued"]["video"] == 0
+
+
+def test_cancel_while_queued_leaks_nothing():
+    controller = make_controller()
+
+    async def queued_request():
+        async with controller.admit("video"):
+            pass
+
+    async def main():
+        async with controller.admit("video"):
+            waiter = asyncio.ensure_future(queued_request())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            assert controller.snapshot()["queued"]["video"] == 0
+        # The slot and the queue place are both free again
+        async with controller.admit("video"):
+            pass
+
+    asyncio.run(main())
+
+    assert controller.snapshot()["active"]["video"] == 0
+
+
+def test_upload_tickets_are_capped_at_limit_plus_queue():
+    controller = make_controller()
+
+    assert controller.reserve_upload("video")
+    assert controller.reserve_upload("video")
+    assert not controller.reserve_upload("video")
+    controller.release_upload("video")
+    assert controller.reserve_upload("video")
+
+
+def test_gate_admits_concurrent_uploads_up_to_capacity(monkeypatch):
+    controller = make_controller()
+    monkeypatch.setattr("services.admission.GATED_PATHS", {"/llm/process-video": "video"})
+    reached = []
+
+    async def main():
+        finish = asyncio.Event()
+
+        async def app(scope, receive, send):
+            # Stands in for spooling the body and running the route
+            reached.append(scope["path"])
+            await finish.wait()
+
+        async def receive():
+            raise AssertionError("rejected uploads must not be read")
+
+        async def call(path):
+            messages = []
+
+            async def send(message):
+                messages.append(message)
+
+            scope = {"type": "http", "method": "POST", "path": path, "headers": [(b"content-length", b"1024")]}
+            await AdmissionGate(app, controller)(scope, receive, send)
+            return messages
+
+        calls = [asyncio.ensure_future(call("/llm/process-video")) for _ in range(50)]
+        await asyncio.sleep(0.01)
+        other = asyncio.ensure_future(call("/lessons"))
+        await asyncio.sleep(0.01)
+        assert controller.snapshot()["uploads"]["video"] == 2
+        finish.set()
+        responses = await asyncio.gather(*calls)
+        await other
+
+        # Tickets are given back once the responses finish
+        assert controller.snapshot()["uploads"]["video"] == 0
+        return responses
+
+    responses = asyncio.run(main())
+
+    rejected = [messages for messages in responses if messages]
+    assert len(rejected) == 48
+    assert all(messages[0]["status"] == 503 for messages in rejected)
+    assert int(dict(rejected[0][0]["headers"])[b"retry-after"]) >= 1
+    assert reached.count("/llm/process-video") == 2
+    assert reached.count("/lessons") == 1
+
+
+def test_gate_rejects_oversized_upload(monkeypatch):
+    monkeypatch.setattr("services.admission.GATED_PATHS", {"/llm/process-video": "video"})
+    monkeypatch.setattr("services.admission.MAX_UPLOAD_BYTES", 100)
+    messages = []
+
+    async def app(scope, receive, send):
+        raise AssertionError("oversized uploads must not reach the app")
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": "/llm/process-video", "headers": [(b"content-length", b"101")]}
+    asyncio.run(AdmissionGate(app, make_controller())(scope, None, send))
+
+    assert messages[0]["status"] == 413
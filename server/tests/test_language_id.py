@@ -0,0 +1,26 @@
+import asyncio
+
+import pytest
+
+from services.language_id import LanguageIdentifier, iso_code
+
+
+@pytest.mark.parametrize("language_code, expected", [
+    ("fr-CA", "fr"),
+    ("es", "es"),
+    ("cmn-Hans-CN", "zh"),
+    ("yue-Hant-HK", "zh"),
+])
+def test_iso_code(language_code, expected):
+    assert iso_code(language_code) == expected
+
+
+def test_identify_keeps_the_candidate_locale(monkeypatch):
+    identifier = LanguageIdentifier()
+    monkeypatch.setattr(identifier, "is_available", lambda: True)
+    monkeypatch.setattr(identifier, "_language_probabilities", lambda sample_path: {"zh": 0.9, "en": 0.1})
+
+    result = asyncio.run(identifier.identify("sample.wav", ["en-US", "cmn-Hans-CN"]))
+
+    assert result["language_code"] == "cmn-Hans-CN"
+    assert result["language"] == "Chinese"
@@ -0,0 +1,122 @@
+import pytest
+
+from services.lesson_store import LessonStore, detail_key, normalize_lemma
+
+
+def make_plan(words, questions=("¿Dónde vive el gato?",)):
+    return {
+        "detected_language": "Spanish",
+        "proficiency_level": "A2",
+        "summary": "Un gato en la ciudad",
+        "vocabulary_words": [
+            {"word": word, "translation": translation, "definition": "", "example_sentence": ""}
+            for word, translation in words
+        ],
+        "sentence_structures": [],
+        "comprehension_questions": [{"question": question} for question in questions],
+        "learning_objectives": []
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LessonStore(tmp_path / "lingua.db")
+    store.connect()
+    yield store
+    store.close()
+
+
+def test_update_section_keeps_other_sections(store):
+    lesson_id = store.save_lesson("El gato vive aquí.", make_plan([("el gato", "the cat")]))
+
+    # Two regenerations read the same plan, then write different sections
+    store.update_section(lesson_id, "vocabulary_words", make_plan([("el perro", "the dog")])["vocabulary_words"])
+    plan = store.update_section(lesson_id, "comprehension_questions", [{"question": "¿Qué come el perro?"}])
+
+    assert [word["word"] for word in plan["vocabulary_words"]] == ["el perro"]
+    assert plan["comprehension_questions"] == [{"question": "¿Qué come el perro?"}]
+    assert store.get_lesson(lesson_id)["lesson_plan"] == plan
+    assert [entry["word"] for entry in store.search_vocabulary("perro")] == ["el perro"]
+    assert store.update_section(lesson_id + 1, "vocabulary_words", []) is None
+
+
+def test_update_lesson_plan_reindexes_vocabulary(store):
+    lesson_id = store.save_lesson("El gato vive aquí.", make_plan([("el gato", "the cat")]))
+
+    assert [lesson["lesson_id"] for lesson in store.search_lessons("gato")] == [lesson_id]
+    assert [entry["word"] for entry in store.search_vocabulary("gato")] == ["el gato"]
+
+    store.update_lesson_plan(lesson_id, make_plan([("la casa", "the house")]))
+
+    # Old vocabulary no longer matches, new vocabulary does
+    assert store.search_vocabulary("gato") == []
+    assert store.search_vocabulary("cat") == []
+    assert [entry["lesson_id"] for entry in store.search_vocabulary("casa")] == [lesson_id]
+    assert [lesson["lesson_id"] for lesson in store.search_lessons("house")] == [lesson_id]
+
+
+def test_linked_video_finds_the_stored_lesson(store):
+    lesson_id = store.save_lesson("Hola.", make_plan([]), video_sha256="original", video_sampled_hash="original-s")
+    store.link_video(lesson_id, "reencoded", "reencoded-s")
+
+    assert store.find_by_video_hash("original")["lesson_id"] == lesson_id
+    assert store.find_by_video_hash("reencoded")["lesson_id"] == lesson_id
+    assert store.find_by_sampled_hash("reencoded-s")["lesson_id"] == lesson_id
+    assert store.find_by_video_hash("unknown") is None
+
+    encoded = store.find_json_by_video_hash("unknown", "reencoded-s")
+    assert encoded == store.get_lesson_json(lesson_id)
+    # One lesson, not a copy per video
+    assert len(store.list_lessons()) == 1
+
+
+def test_list_lessons_filters_by_language_name_or_code(store):
+    spanish = store.save_lesson("Hola.", make_plan([]))
+    also_spanish = store.save_lesson("Buenos días.", dict(make_plan([]), detected_language="español"))
+    store.save_lesson("Bonjour.", dict(make_plan([]), detected_language="French"))
+
+    for language in ("es", "Spanish", "SPANISH", "es-ES"):
+        assert [lesson["lesson_id"] for lesson in store.list_lessons(language=language)] == [also_spanish, spanish]
+    assert len(store.list_lessons()) == 3
+    assert store.list_lessons(language="de") == []
+
+
+def test_search_vocabulary_filters_by_language(store):
+    store.save_lesson("El gato.", make_plan([("el gato", "the cat")]))
+    store.save_lesson("Le chat.", dict(make_plan([("le chat", "the cat")]), detected_language="French"))
+
+    assert [entry["word"] for entry in store.search_vocabulary("cat", language="es")] == ["el gato"]
+    assert [entry["word"] for entry in store.search_vocabulary("cat", language="French")] == ["le chat"]
+
+
+@pytest.mark.parametrize("text, language, lemma", [
+    ("El Gato", "Spanish", "gato"),
+    ("el gato", None, "gato"),
+    ("l'été", "fr", "ete"),
+    ("The house", "English", "house"),
+    # Prepositions are part of the expression
+    ("de nuevo", "Spanish", "de nuevo"),
+    ("a menudo", "Spanish", "a menudo"),
+    ("a menudo", None, "a menudo"),
+    # A lone article is the word itself
+    ("la", "Spanish", "la"),
+])
+def test_normalize_lemma(text, language, lemma):
+    assert normalize_lemma(text, language) == lemma
+
+
+def test_detail_keys_separate_homographs_and_languages(store):
+    bench = {"description": "seat", "examples": []}
+    bank = {"description": "money", "examples": []}
+    store.save_detail("vocab", "banco", bench, translation="bench", language="Spanish")
+    store.save_detail("vocab", "el banco", bank, translation="the bank", language="Spanish")
+
+    assert store.get_detail("vocab", "Banco", translation="Bench", language="es") == bench
+    assert store.get_detail("vocab", "banco", translation="bank", language="Spanish") == bank
+    assert store.get_detail("vocab", "banco", translation="bench", language="Italian") is None
+
+    present_perfect = {"description": "have + past participle", "examples": []}
+    store.save_detail("grammar", "Present Perfect", present_perfect, language="English")
+    assert store.get_detail("grammar", "present perfect", language="en") == present_perfect
+    assert store.get_detail("grammar", "Present Perfect", language="Spanish") is None
+    assert detail_key("grammar", "Present Perfect", language="English") == ("grammar", "present perfect", "", "en")
@@ -0,0 +1,170 @@
+import asyncio
+import multiprocessing
+import time
+
+import pytest
+
+from services import shared_cache as shared_cache_module
+from services.shared_cache import SharedCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SharedCache(tmp_path / "cache.db")
+    cache.connect()
+    yield cache
+    cache.close()
+
+
+def test_concurrent_requests_share_one_computation(cache):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"value": 42}
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_compute("key", compute) for _ in range(5)))
+
+    results = asyncio.run(main())
+
+    assert results == [{"value": 42}] * 5
+    assert len(calls) == 1
+    assert cache.get("key") == {"value": 42}
+
+
+def _compute_in_worker(db_path, log_path):
+    """Runs in a separate process: one uvicorn worker asking for the shared key"""
+    async def compute():
+        with open(log_path, "a") as f:
+            f.write("computed\n")
+        await asyncio.sleep(0.5)
+        return "shared"
+
+    cache = SharedCache(db_path)
+    assert asyncio.run(cache.get_or_compute("key", compute)) == "shared"
+
+
+def test_single_flight_across_processes(tmp_path):
+    db_path = str(tmp_path / "cache.db")
+    log_path = tmp_path / "computed.log"
+    log_path.touch()
+
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=_compute_in_worker, args=(db_path, str(log_path))) for _ in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+
+    assert [process.exitcode for process in processes] == [0, 0, 0]
+    assert log_path.read_text().count("computed") == 1
+
+
+def test_last_waiter_cancelled_cancels_computation(cache):
+    state = {"cancelled": False}
+
+    async def compute():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+        return "never"
+
+    async def main():
+        waiters = [asyncio.ensure_future(cache.get_or_compute("key", compute)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+
+    assert state["cancelled"]
+    assert cache.stats["cancelled"] == 1
+    assert cache.get("key") is None
+    # The lease is released so another worker can take over
+    assert cache._get_conn().execute("SELECT COUNT(*) FROM inflight").fetchone()[0] == 0
+
+
+def test_remaining_waiter_keeps_computation_alive(cache):
+    async def compute():
+        await asyncio.sleep(0.1)
+        return "done"
+
+    async def main():
+        leaving = asyncio.ensure_future(cache.get_or_compute("key", compute))
+        staying = asyncio.ensure_future(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0.02)
+        leaving.cancel()
+        return await staying
+
+    assert asyncio.run(main()) == "done"
+    assert cache.stats["cancelled"] == 0
+
+
+def test_remote_interest_keeps_computation_alive(cache, tmp_path):
+    other_worker = SharedCache(tmp_path / "cache.db")
+    computed = []
+
+    async def compute():
+        await asyncio.sleep(0.2)
+        computed.append(1)
+        return "done"
+
+    async def main():
+        waiter = asyncio.ensure_future(cache.get_or_compute("key", compute))
+        await asyncio.sleep(0.02)
+        # Another process is polling for the same key
+        other_worker._register_interest("key")
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        await asyncio.sleep(0.3)
+
+    asyncio.run(main())
+
+    assert computed == [1]
+    assert cache.stats["kept_for_waiters"] == 1
+    assert cache.get("key") == "done"
+
+
+def test_release_runs_when_started_computation_finishes(cache):
+    events = []
+
+    async def main():
+        finish = asyncio.Event()
+
+        async def compute():
+            await finish.wait()
+            events.append("computed")
+            return "value"
+
+        owner = asyncio.ensure_future(cache.get_or_compute("key", compute, release=lambda: events.append("owner")))
+        await asyncio.sleep(0.02)
+        joined = asyncio.ensure_future(cache.get_or_compute("key", compute, release=lambda: events.append("joined")))
+        await asyncio.sleep(0.02)
+        finish.set()
+        await asyncio.gather(owner, joined)
+        await cache.get_or_compute("key", compute, release=lambda: events.append("hit"))
+
+    asyncio.run(main())
+
+    # Joined and cache-hit callers don't need their inputs; the owner's are kept until compute is done
+    assert events == ["joined", "computed", "owner", "hit"]
+
+
+def test_expired_rows_are_swept(cache, monkeypatch):
+    monkeypatch.setattr(shared_cache_module, "SWEEP_EVERY_SETS", 2)
+    cache.set("expired", "old", ttl=-1)
+    cache._register_interest("key")
+    conn = cache._get_conn()
+    with conn:
+        conn.execute("UPDATE interest SET expires_at = ?", (time.time() - 1,))
+
+    cache.set("fresh", "new")
+
+    assert [row[0] for row in conn.execute("SELECT key FROM cache")] == ["fresh"]
+    assert conn.execute("SELECT COUNT(*) FROM interest").fetchone()[0] == 0